@@ -3,11 +3,13 @@ import tkcalendar as tkcal
 from tkinter import filedialog, messagebox, ttk
 from tkinter.font import Font
 from PIL import Image, ImageTk, UnidentifiedImageError
+import multiprocessing
 import os
 import sys
-import pandas as pd
 import utilities.constants as const
+import utilities.data_utils as du
 import utilities.builder as bu
+import utilities.calendar_utils as cu
 import webbrowser
 
 class ToolTip:
@@ -65,6 +67,7 @@ class Application(tk.Frame):
         self.master.title("Passive Engineering Report Generator - v2")
         self.master.geometry('800x770')
         self.output_folder = os.path.join(os.path.expanduser("~"), "Downloads")
+        self.dataset = None
         self.create_widgets()
 
     def create_widgets(self):
@@ -175,6 +178,14 @@ class Application(tk.Frame):
         self.quit_btn = ttk.Button(self.buttons_frame, text="QUIT", command=self.master.destroy)
         self.quit_btn.grid(row=0, column=1, padx=10, ipadx=10, ipady=5)
 
+        # Number of decks built at the same time for the Engineering and Impact batches
+        self.workers_label = ttk.Label(self.buttons_frame, text="Workers")
+        self.workers_label.grid(row=0, column=2, padx=(30, 5))
+        self.workers_var = tk.IntVar(value=const.BATCH_WORKERS or os.cpu_count() or 1)
+        self.workers_spinbox = ttk.Spinbox(self.buttons_frame, from_=1, to=max(os.cpu_count() or 1, 1) * 2, width=4, textvariable=self.workers_var, font=self.default_font)
+        self.workers_spinbox.grid(row=0, column=3, padx=5)
+        ToolTip(self.workers_spinbox, "Number of reports built at the same time for the Engineering and Impact batches - 1 builds them one after another")
+
     def upload_file(self):
         self.file_path = filedialog.askopenfilename()
         self.clear_impacted_areas()  # Clear impacted areas when a new file is uploaded
@@ -199,13 +210,14 @@ class Application(tk.Frame):
         if self.file_path:
             try:
                 self.file_label.config(text=self.file_path.split("/")[-1])
-                df = pd.read_csv(self.file_path)
-                if 'Project Updates' in df.columns:
+                # Only the header is read here, the rest of the file is parsed once when it is first needed
+                self.dataset = du.ReportDataset(self.file_path)
+                if self.dataset.family == 'project':
                     self.display_project_options()
-                elif 'ContactType' in df.columns:
+                elif self.dataset.family == 'contact':
                     self.display_contact_options()
                     self.show_contact_names()  # Automatically show contact names if Contact Log Report is detected
-                elif 'Doc Reference' in df.columns:
+                elif self.dataset.family == 'document':
                     self.display_document_options()
                 else:
                     messagebox.showerror("Error", "Unknown file type")
@@ -318,8 +330,7 @@ class Application(tk.Frame):
     def update_contact_names_checkbuttons(self):
         self.clear_contact_names()
         try:
-            df = pd.read_csv(self.file_path)
-            unique_names = df['Closed by'].dropna().unique()
+            unique_names = self.dataset.distinct_values('Closed by')
             engineers = ["Chris Kelly", "Andy Oxford", "Luke Phillips", "Matthew Harbord", "Neil Griffin", "Gordon Pyrah", "Tom Wright"]
 
             for i, name in enumerate(sorted(unique_names)):
@@ -362,8 +373,7 @@ class Application(tk.Frame):
     def update_release_group_combobox(self):
         # Assuming the CSV contains a column 'Release Group' with the relevant values
         try:
-            df = pd.read_csv(self.file_path)
-            release_groups = df['Release Group'].dropna().unique().tolist()
+            release_groups = self.dataset.distinct_values('Release Group')
             self.release_group_combobox['values'] = release_groups
         except Exception as e:
             messagebox.showerror("Error", f"Error loading release groups: {e}")
@@ -378,8 +388,7 @@ class Application(tk.Frame):
     def update_impacted_areas_checkbuttons(self):
         self.clear_impacted_areas()
         try:
-            df = pd.read_csv(self.file_path)
-            impacted_areas_series = df['Impacted Teams'].dropna().apply(lambda x: x.split(','))
+            impacted_areas_series = [teams.split(',') for teams in self.dataset.distinct_values('Impacted Teams')]
             impacted_areas = sorted(set(area.strip().strip('[]"') for sublist in impacted_areas_series for area in sublist))
             for i, area in enumerate(impacted_areas):
                 var = tk.BooleanVar(value=False)
@@ -415,69 +424,71 @@ class Application(tk.Frame):
             return
 
         try:
-            df = pd.read_csv(self.file_path)
+            # Parsed once per session - every builder below reuses the same DataFrame
+            data = self.dataset.frame
             const.FILE_LOCATIONS['project_csv'] = self.file_path  # Update the path in constants
             const.FILE_LOCATIONS['document_csv'] = self.file_path  # Update the path in constants
 
             files_created = 0
 
             if self.option_vars.get('engineering', tk.BooleanVar(value=False)).get():
-                files_created += bu.engineering_presentation(self.file_path, self.output_folder)
+                files_created += bu.engineering_presentation(data, self.output_folder, workers=self.workers_var.get())
             if self.option_vars.get('impact', tk.BooleanVar(value=False)).get():
                 selected_impacted_areas = [area for area, var in self.impacted_areas_vars.items() if var.get()]
                 if selected_impacted_areas:
-                    files_created += bu.impact_presentation(self.file_path, selected_impacted_areas, self.output_folder)
+                    files_created += bu.impact_presentation(data, selected_impacted_areas, self.output_folder, workers=self.workers_var.get())
                 else:
-                    bu.allimpacted_presentation(self.file_path, self.output_folder)
+                    bu.allimpacted_presentation(data, self.output_folder)
                     files_created += 1
             if self.option_vars.get('allimpacted', tk.BooleanVar(value=False)).get():
-                bu.allimpacted_presentation(self.file_path, self.output_folder)
+                bu.allimpacted_presentation(data, self.output_folder)
                 files_created += 1
             if self.option_vars.get('who', tk.BooleanVar(value=False)).get():
-                bu.who_presentation(self.file_path, None, self.output_folder)
+                bu.who_presentation(data, None, self.output_folder)
                 files_created += 1
             if self.option_vars.get('onhold', tk.BooleanVar(value=False)).get():
-                bu.onhold_presentation(self.file_path, self.output_folder)
+                bu.onhold_presentation(data, self.output_folder)
                 files_created += 1
             if self.option_vars.get('objective', tk.BooleanVar(value=False)).get():
-                bu.objective_presentation(self.file_path, self.output_folder)
+                bu.objective_presentation(data, self.output_folder)
                 files_created += 1
             if self.option_vars.get('projects', tk.BooleanVar(value=False)).get():
-                bu.projects_presentation(self.file_path, self.output_folder)
+                bu.projects_presentation(data, self.output_folder)
                 files_created += 1
             if self.option_vars.get('output_all', tk.BooleanVar(value=False)).get():
-                bu.output_all_presentation(self.file_path, self.output_folder)
+                bu.output_all_presentation(data, self.output_folder)
                 files_created += 1
             if self.option_vars.get('release', tk.BooleanVar(value=False)).get():
                 release_group = self.release_group_var.get()
                 if release_group:
-                    bu.release_presentation(self.file_path, release_group, internal=False, output_folder=self.output_folder)
+                    bu.release_presentation(data, release_group, internal=False, output_folder=self.output_folder)
                     files_created += 1
                 else:
                     messagebox.showerror("Error", "Please select a release group for the release report")
             if self.option_vars.get('internal_release', tk.BooleanVar(value=False)).get():
                 release_group = self.release_group_var.get()
                 if release_group:
-                    bu.release_presentation(self.file_path, release_group, internal=True, output_folder=self.output_folder)
+                    bu.release_presentation(data, release_group, internal=True, output_folder=self.output_folder)
                     files_created += 1
                 else:
                     messagebox.showerror("Error", "Please select a release group for the internal release report")
             if self.option_vars.get('docs', tk.BooleanVar(value=False)).get():
-                bu.docs_presentation(self.file_path, self.output_folder)
+                bu.docs_presentation(data, self.output_folder)
                 files_created += 1
             if self.option_vars.get('document_changes', tk.BooleanVar(value=False)).get():
-                bu.document_changes_presentation(self.file_path, self.output_folder)
+                bu.document_changes_presentation(data, self.output_folder)
                 files_created += 1
             
             if self.option_vars.get('contact', tk.BooleanVar(value=False)).get():
                 selected_names = [name for name, var in self.contact_names_vars.items() if var.get()]
                 start_date = self.start_date_entry.get_date().strftime('%Y-%m-%d')
                 end_date = self.end_date_entry.get_date().strftime('%Y-%m-%d')
+                calendar = cu.load_business_calendar()
                 if selected_names:
-                    bu.contact_report_presentation(self.file_path, self.output_folder, selected_names, start_date=start_date, end_date=end_date)
+                    bu.contact_report_presentation(data, self.output_folder, selected_names, start_date=start_date, end_date=end_date, calendar=calendar)
                     files_created += 1
                 else:
-                    bu.contact_report_presentation(self.file_path, self.output_folder, start_date=start_date, end_date=end_date)
+                    bu.contact_report_presentation(data, self.output_folder, start_date=start_date, end_date=end_date, calendar=calendar)
                     files_created += 1
 
             # Show toast notification
@@ -542,4 +553,5 @@ def start_gui():
     app.mainloop()
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     start_gui()
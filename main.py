@@ -1,9 +1,11 @@
 import argparse
+import multiprocessing
 import os
 import utilities.data_utils as du
 import utilities.presentation_utils as pu
 import utilities.constants as const
 import utilities.builder as bu
+import utilities.calendar_utils as cu
 
 def create_folders(folder_names=['output', 'raw', 'templates', 'utilities']):
     for folder_name in folder_names:
@@ -41,6 +43,11 @@ def main():
     parser.add_argument("--gui", action="store_true", help="Launch the graphical user interface")
     parser.add_argument("--projectBoard", action="store_true", help="Save the Engineering Project Board slides")
     parser.add_argument("--contact", action="store_true", help="Produce the ContactBoard Report")
+    parser.add_argument("--chunksize", type=int, help="Stream the contact CSV in chunks of this many rows instead of loading it whole")
+    parser.add_argument("--workers", type=int, help="Number of worker processes building the per-engineer and per-team decks, or drawing the contact report charts, 1 does the work one step after another")
+    parser.add_argument("--holidays", type=str, help="Specify a file of public holidays, one date per line, excluded from business day ages")
+    parser.add_argument("--save_profile", choices=sorted(const.SAVE_PROFILES), help="How the saved decks are compressed: 'draft' saves faster with larger files, 'store' skips compression, 'final' gives the smallest files. Defaults to 'standard'")
+    parser.add_argument("--snapshot", action="store_true", help="Convert the CSV exports into columnar snapshots that later runs load instead of re-parsing the CSV")
 
     args = parser.parse_args()
     internal = args.internal
@@ -51,54 +58,64 @@ def main():
 
     gui_trigger = 1
 
+    if args.snapshot:
+        gui_trigger = 0
+        for csv_file in [project_csv, document_csv, contact_csv]:
+            if os.path.exists(csv_file):
+                snapshot = du.write_snapshot(csv_file)
+                if snapshot:
+                    print(f"Created snapshot: {snapshot}")
     if args.gui:
         gui_trigger = 0
         run_gui()
     if args.engineering:
         gui_trigger = 0
-        bu.engineering_presentation(project_csv=project_csv, output_folder=output_folder)
+        bu.engineering_presentation(project_csv=project_csv, output_folder=output_folder, workers=args.workers, save_profile=args.save_profile)
     if args.who:
         gui_trigger = 0
         name_filter = input("Who: ")
-        bu.who_presentation(project_csv=project_csv, name_filter=name_filter, output_folder=output_folder)
+        bu.who_presentation(project_csv=project_csv, name_filter=name_filter, output_folder=output_folder, save_profile=args.save_profile)
     if args.impact:
         gui_trigger = 0
         impact_filter = input("Impacted Area: ")
-        bu.impact_presentation(project_csv=project_csv, impact_filter=impact_filter, output_folder=output_folder)
+        bu.impact_presentation(project_csv=project_csv, impact_filter=impact_filter, output_folder=output_folder, workers=args.workers, save_profile=args.save_profile)
     if args.allimpacted:
         gui_trigger = 0
-        bu.allimpacted_presentation(project_csv=project_csv, output_folder=output_folder)
+        bu.allimpacted_presentation(project_csv=project_csv, output_folder=output_folder, save_profile=args.save_profile)
     if args.objective:
         gui_trigger = 0
-        bu.objective_presentation(project_csv=project_csv, output_folder=output_folder)
+        bu.objective_presentation(project_csv=project_csv, output_folder=output_folder, save_profile=args.save_profile)
     if args.onhold:
         gui_trigger = 0
-        bu.onhold_presentation(project_csv=project_csv, output_folder=output_folder)
+        bu.onhold_presentation(project_csv=project_csv, output_folder=output_folder, save_profile=args.save_profile)
     if args.projects:
         gui_trigger = 0
-        bu.projects_presentation(project_csv=project_csv, output_folder=output_folder)
+        bu.projects_presentation(project_csv=project_csv, output_folder=output_folder, save_profile=args.save_profile)
     if args.docs:
         gui_trigger = 0
         date_filter = input("Date: ")
-        bu.docs_presentation(document_csv=document_csv, date_filter=date_filter, output_folder=output_folder)
+        bu.docs_presentation(document_csv=document_csv, date_filter=date_filter, output_folder=output_folder, save_profile=args.save_profile)
     if args.document_changes:
         gui_trigger = 0
-        bu.document_changes_presentation(document_csv=document_csv, output_folder=output_folder)
+        bu.document_changes_presentation(document_csv=document_csv, output_folder=output_folder, save_profile=args.save_profile)
     if args.output_all:
         gui_trigger = 0
-        bu.output_all_presentation(project_csv=project_csv, output_folder=output_folder)
+        bu.output_all_presentation(project_csv=project_csv, output_folder=output_folder, save_profile=args.save_profile)
     if args.release:
         gui_trigger = 0
         release_group = input("Release Group: ")
-        bu.release_presentation(document_csv=document_csv, release_group=release_group, internal=internal, output_folder=output_folder)
+        bu.release_presentation(document_csv=document_csv, release_group=release_group, internal=internal, output_folder=output_folder, save_profile=args.save_profile)
     if args.projectBoard:
         gui_trigger = 0
-        bu.engineering_review_board_presentation(project_csv=project_csv, output_folder=output_folder)
+        bu.engineering_review_board_presentation(project_csv=project_csv, output_folder=output_folder, save_profile=args.save_profile)
     if args.contact:
         gui_trigger = 0
-        bu.contact_report_presentation(contact_csv=contact_csv, output_folder=output_folder, start_date='2024-01-01', end_date='2024-12-31')
+        calendar = cu.load_business_calendar(args.holidays)
+        bu.contact_report_presentation(contact_csv=contact_csv, output_folder=output_folder, start_date='2024-01-01', end_date='2024-12-31', chunksize=args.chunksize, calendar=calendar, workers=args.workers, save_profile=args.save_profile)
     if gui_trigger:
         run_gui()
 
 if __name__ == "__main__":
+    # Needed for the worker processes of the HTML pre-render stage in the packaged executable
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,74 @@
+import pandas as pd
+
+import utilities.data_utils as du
+
+
+def test_parse_dates_keeps_values_in_other_formats():
+    # The format is inferred from the first value, the others must still be parsed
+    series = pd.Series(['05/03/2024 10:00', '2024-03-06 11:00', '07/03/2024'])
+    parsed = du.parse_dates(series)
+    assert parsed.tolist() == [pd.Timestamp('2024-03-05 10:00'), pd.Timestamp('2024-03-06 11:00'), pd.Timestamp('2024-03-07')]
+
+
+def test_parse_dates_date_only_value_in_timestamp_column():
+    series = pd.Series(['20/08/2023 11:41', '01/02/2024 09:05', '21/08/2023'], index=[3, 5, 7])
+    parsed = du.parse_dates(series)
+    assert parsed.loc[7] == pd.Timestamp('2023-08-21')
+    assert parsed.notna().all()
+
+
+def test_parse_dates_unparseable_values_become_nat():
+    parsed = du.parse_dates(pd.Series(['20/08/2023 11:41', None, '', 'not a date']))
+    assert parsed.iloc[0] == pd.Timestamp('2023-08-20 11:41')
+    assert parsed.iloc[1:].isna().all()
+
+
+def test_team_index_follows_replaced_column():
+    df = pd.DataFrame({'Impacted Teams': ['["Build","Ops"]', '["Ops"]'], 'Staging': ['Assessing', 'Testing']})
+    assert du.impacted_teams_list(df) == ['Build', 'Ops']
+
+    df['Impacted Teams'] = ['["Design"]', '["Ops"]']
+    assert du.impacted_teams_list(df) == ['Design', 'Ops']
+    assert list(du.team_index(df)['Design']) == [0]
+
+
+def test_team_index_refreshed_after_cell_edit():
+    df = pd.DataFrame({'Impacted Teams': ['["Build","Ops"]', '["Ops"]'], 'Staging': ['Assessing', 'Testing']})
+    assert du.impacted_teams_list(df) == ['Build', 'Ops']
+
+    df.loc[0, 'Impacted Teams'] = '["Design"]'
+    du.refresh_frame_indexes(df)
+    assert du.impacted_teams_list(df) == ['Design', 'Ops']
+
+
+def test_filter_by_team_builds_index_once(monkeypatch):
+    teams = ['Team %d' % number for number in range(40)]
+    df = pd.DataFrame({'Impacted Teams': ['["%s"]' % teams[row % 40] for row in range(20000)]})
+
+    calls = {'split': 0, 'hash': 0}
+    split_teams, hash_object = du._split_teams, pd.util.hash_pandas_object
+
+    def counting_split(series):
+        calls['split'] += 1
+        return split_teams(series)
+
+    def counting_hash(*args, **kwargs):
+        calls['hash'] += 1
+        return hash_object(*args, **kwargs)
+
+    monkeypatch.setattr(du, '_split_teams', counting_split)
+    monkeypatch.setattr(pd.util, 'hash_pandas_object', counting_hash)
+
+    for _ in range(3):
+        for team in teams:
+            assert len(du.filter_dataframe_by_team(df, team)) == 500
+    assert calls == {'split': 1, 'hash': 0}
+
+
+def test_frame_index_entry_dropped_with_its_frame():
+    df = pd.DataFrame({'Impacted Teams': ['["Build"]']})
+    du.impacted_teams_list(df)
+    key = (id(df), 'Impacted Teams')
+    assert key in du._FRAME_INDEX_CACHE
+    del df
+    assert key not in du._FRAME_INDEX_CACHE
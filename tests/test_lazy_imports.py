@@ -0,0 +1,69 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROJECT_CSV = """ID,Title,Objective,Staging,Priority,Status,Closure Comments,Primary Owner,Project Summary,Impacted Teams,Lead Team,Project Updates,Project Actions,Estimated Effort,Estimated Impact
+1,Project one,Quality,Roll-out,P1,New,,Tom Wright,Summary,"[""Design""]",Passive Engineering,<p>Update</p>,<p>Action</p>,Days,Low
+2,Project two,Safety,Beta Test,P2,Open,,Andy Oxford,Summary,"[""Planning""]",Regional Technical Leads,Plain update,,Weeks,High
+"""
+
+DOCUMENT_CSV = """Doc Reference,Title,Primary Owner,Status,Release Group,Release Text,Release Urgency,Impact,Impacted Teams,Lead Team,Release Forecast
+DOC-001-NEW,Doc one,Tom Wright,New,Jan-24,<p>New document</p>,Housekeeping,,"[""Design""]",Passive Engineering,Jan
+DOC-002,Doc two,Andy Oxford,Ready to Release,Jan-24,<p>Updated</p>,,"[""BDUK""]","[""Planning""]",Regional Technical Leads,Jan
+"""
+
+# Runs main.main() with the report flag and prints the outcome and whether matplotlib was imported
+RUNNER = """
+import json, sys
+sys.path.insert(0, {root!r})
+sys.argv = ['main.py', {flag!r}, '--project_csv', {project_csv!r}, '--document_csv', {document_csv!r}, '--output_folder', {output_folder!r}]
+import main
+error = None
+try:
+    main.main()
+except Exception as exc:
+    error = type(exc).__name__ + ': ' + str(exc)
+print(json.dumps({{'error': error, 'matplotlib': 'matplotlib' in sys.modules}}))
+"""
+
+
+def run_report(tmp_path, flag, answer=''):
+    project_csv = tmp_path / 'PROJECT.csv'
+    document_csv = tmp_path / 'DOCUMENT.csv'
+    project_csv.write_text(PROJECT_CSV, encoding='utf-8')
+    document_csv.write_text(DOCUMENT_CSV, encoding='utf-8')
+    output_folder = tmp_path / 'output'
+    output_folder.mkdir()
+
+    code = RUNNER.format(root=ROOT, flag=flag, project_csv=str(project_csv), document_csv=str(document_csv), output_folder=str(output_folder))
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, input=answer + '\n', capture_output=True, text=True, timeout=300)
+    assert result.returncode == 0, result.stderr
+    # The prompt for the release group is printed on the same line
+    last_line = result.stdout.strip().splitlines()[-1]
+    return json.loads(last_line[last_line.index('{'):])
+
+
+def test_release_report_does_not_import_matplotlib(tmp_path):
+    outcome = run_report(tmp_path, '--release', 'Jan-24')
+    assert outcome['error'] is None
+    assert not outcome['matplotlib']
+
+
+def test_projects_report_does_not_import_matplotlib(tmp_path):
+    # The bundled template has no placeholder for the project summary, so the deck itself may not be
+    # finished, but nothing on the way to it may load matplotlib
+    outcome = run_report(tmp_path, '--projects')
+    assert not outcome['matplotlib']
+
+
+@pytest.mark.parametrize('module', ['main', 'gui'])
+def test_modules_do_not_import_matplotlib(module):
+    code = f"import sys; sys.path.insert(0, {ROOT!r}); import {module}; print('matplotlib' in sys.modules)"
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, timeout=300)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == 'False'
@@ -0,0 +1,106 @@
+import os
+import zipfile
+
+import pandas as pd
+import pytest
+
+import utilities.constants as const
+import utilities.presentation_utils as pu
+from pptx import Presentation
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMPLATE = os.path.join(ROOT, 'templates', '_template.pptx')
+
+
+def sample_presentation():
+    prs = pu.create_blank_presentation(TEMPLATE)
+    pu.create_title_slide(prs, 'Save profiles')
+    slide = prs.slides.add_slide(prs.slide_masters[1].slide_layouts[5])
+    pu.set_title(slide, 'Buttons')
+    for index in range(4):
+        pu.create_project_button(slide, index * 100000, 0, contents_text=f'Project {index}\nOwner')
+    return prs
+
+
+@pytest.mark.parametrize('save_profile', sorted(const.SAVE_PROFILES))
+def test_write_presentation_uses_profile_compression(tmp_path, save_profile):
+    prs = sample_presentation()
+    path = tmp_path / f'{save_profile}.pptx'
+    with open(path, 'wb') as file:
+        pu.write_presentation(prs, file, save_profile)
+
+    profile = const.SAVE_PROFILES[save_profile]
+    expected = zipfile.ZIP_DEFLATED if profile is None else profile['compression']
+    with zipfile.ZipFile(path) as saved:
+        assert saved.testzip() is None
+        assert {info.compress_type for info in saved.infolist()} == {expected}
+    assert len(Presentation(str(path)).slides) == len(prs.slides)
+
+
+def test_write_presentation_leaves_python_pptx_writer_unchanged(tmp_path):
+    prs = sample_presentation()
+    with open(tmp_path / 'store.pptx', 'wb') as file:
+        pu.write_presentation(prs, file, 'store')
+    prs.save(str(tmp_path / 'default.pptx'))
+    with zipfile.ZipFile(tmp_path / 'default.pptx') as saved:
+        assert {info.compress_type for info in saved.infolist()} == {zipfile.ZIP_DEFLATED}
+
+
+def test_render_chart_image_reuses_image_and_keeps_input(monkeypatch):
+    import utilities.cache_utils as cache
+    monkeypatch.setattr(cache, '_CHART_IMAGE_CACHE', cache.ChartImageCache(8))
+
+    draws = []
+    draw_chart_image = pu.draw_chart_image
+
+    def counting_draw(plot_name, df):
+        draws.append(plot_name)
+        return draw_chart_image(plot_name, df)
+
+    monkeypatch.setattr(pu, 'draw_chart_image', counting_draw)
+
+    summary = pd.DataFrame({'AssignedTo': ['Ann', 'Bob'], 'avg_claim_time': [1.5, 3.0],
+                            'exceed_two_days': [0, 2], 'total_tickets': [4, 5]})
+    before = summary.copy()
+
+    first = pu.render_chart_image('plot_claim_time_summary', summary)
+    second = pu.render_chart_image('plot_claim_time_summary', summary)
+
+    assert draws == ['plot_claim_time_summary']
+    assert first.getvalue() == second.getvalue()
+    pd.testing.assert_frame_equal(summary, before)
+
+
+def test_contact_log_card_shows_creation_date_as_exported():
+    df = pd.DataFrame({'Title': ['Ticket 0', 'Ticket 1'], 'RaisedBy': ['Bob', 'Bob'],
+                       'OriginalCreationDate': pd.Series(['20/08/2023 11:41', None]), 'Claimed?': ['Yes', 'No']})
+    df['OriginalCreationDate'] = pd.to_datetime(df['OriginalCreationDate'], format='%d/%m/%Y %H:%M')
+    text = pu._contact_log_text(df)
+    assert text[0].split('\n')[2] == 'Created: 20/08/2023 11:41'
+    assert text[1].split('\n')[2] == 'Created: nan'
+
+
+class _Summarised(Exception):
+    pass
+
+
+@pytest.mark.parametrize('slide_function, summariser', [
+    ('create_claim_time_summary_table_slide', 'summarise_claim_times'),
+    ('create_closure_time_summary_table_slide', 'filter_and_aggregate_resolution_time'),
+    ('create_resolution_time_by_engineer_slide', 'filter_and_aggregate_resolution_time'),
+])
+def test_contact_table_slides_pass_calendar_on(monkeypatch, slide_function, summariser):
+    import utilities.data_utils as du
+    from utilities.calendar_utils import BusinessCalendar
+
+    calendars = []
+
+    def spy(*args, calendar=None, **kwargs):
+        calendars.append(args[3] if len(args) > 3 else calendar)
+        raise _Summarised
+
+    monkeypatch.setattr(du, summariser, spy)
+    calendar = BusinessCalendar(weekmask='1111111')
+    with pytest.raises(_Summarised):
+        getattr(pu, slide_function)(pd.DataFrame(), None, '', calendar=calendar)
+    assert calendars == [calendar]
@@ -1,8 +1,11 @@
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 import utilities.data_utils as du
 import utilities.presentation_utils as pu
 import utilities.constants as const
+import utilities.cache_utils as cache
 
 def resource_path(relative_path):
     """ Get absolute path to resource, works for dev and for PyInstaller """
@@ -14,29 +17,116 @@ def resource_path(relative_path):
     
     return os.path.join(base_path, relative_path)
 
-def contact_report_presentation(contact_csv, output_folder, selected_names=None, start_date='2024-01-01', end_date='2024-12-31'):
-    df = du.create_blank_dataframe(contact_csv)
-    prs = pu.create_blank_presentation(resource_path(const.FILE_LOCATIONS['pptx_template']))
-
-    # If selected_names is provided, filter the DataFrame
-    if selected_names:
-        df_resolved = du.filter_dataframe_by_names(df, selected_names, 'Closed by')
-        df_assigned = du.filter_dataframe_by_names(df, selected_names, 'AssignedTo')
+# The DataFrame shared by the decks of a batch, set once in each worker process by _init_batch_worker
+_BATCH_DATA = None
+
+def _init_batch_worker(data):
+    global _BATCH_DATA
+    _BATCH_DATA = data
+
+def _render_batch_deck(job):
+    render, kwargs = job
+    return render(_BATCH_DATA, **kwargs)
+
+def render_decks(data, jobs, workers=None):
+    """
+    Build a batch of independent decks, fanned out over a process pool.
+
+    The data is loaded by the caller and sent to each worker once, each job then builds and saves one
+    deck with an existing builder function, called as render(data, **kwargs).
+
+    Parameters:
+    - data (pd.DataFrame): The DataFrame every deck is built from.
+    - jobs (list): (render, kwargs) pairs, render being a module level builder function such as person_filter.
+    - workers (int, optional): Worker processes. Defaults to const.BATCH_WORKERS (1), the number of CPUs if that is None.
+                               With 1 worker, or a single job, the decks are built one after another in this process.
+
+    Returns:
+    - list: What each render call returned, in job order.
+    """
+    if workers is None:
+        workers = const.BATCH_WORKERS or os.cpu_count() or 1
+    workers = min(workers, len(jobs))
+    if workers <= 1:
+        return [render(data, **kwargs) for render, kwargs in jobs]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker, initargs=(data,)) as executor:
+        return list(executor.map(_render_batch_deck, jobs))
+
+@contextmanager
+def render_chart_images(specs, workers=None):
+    """
+    Draw the matplotlib pictures a deck declares up front (see presentation_utils.chart_image_specs), fanned out
+    over a process pool as matplotlib is CPU bound and cannot be shared between threads.
+
+    Pictures in the chart image cache are taken from it. The others are submitted to the pool and handed out as
+    Futures, so the deck is built while they are drawn and each chart slide only waits for its own picture.
+    They are added to the chart image cache when the block exits.
+
+    Parameters:
+    - specs (dict): (plot_name, df) of each picture, keyed by chart.
+    - workers (int, optional): Worker processes. Defaults to const.CHART_WORKERS, or the number of CPUs if that is None.
+                               With 1 worker, or a single picture to draw, the slides draw the missing pictures themselves.
+
+    Yields:
+    - dict: The image bytes, or a Future of them, keyed by chart.
+    """
+    images = {}
+    missing = {}
+    keys = {}
+    for chart, (plot_name, df) in specs.items():
+        keys[chart] = pu.chart_image_key(plot_name, df)
+        image = pu.cached_chart_image(keys[chart])
+        if image is None:
+            missing[chart] = (plot_name, df)
+        else:
+            images[chart] = image
+
+    if workers is None:
+        workers = const.CHART_WORKERS or os.cpu_count() or 1
+    workers = min(workers, len(missing))
+    if workers <= 1:
+        yield images
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {chart: executor.submit(pu.draw_chart_image, plot_name, df) for chart, (plot_name, df) in missing.items()}
+        images.update(futures)
+        yield images
+
+    for chart, future in futures.items():
+        pu.cache_chart_image(keys[chart], future.result())
+
+def contact_report_presentation(contact_csv, output_folder, selected_names=None, start_date='2024-01-01', end_date='2024-12-31', chunksize=None, calendar=None, workers=None, save_profile=None):
+    # With a chunksize the log is streamed and aggregated chunk by chunk instead of being loaded whole
+    if chunksize and isinstance(contact_csv, (str, os.PathLike)):
+        summary = du.aggregate_contact_log(contact_csv, selected_names, start_date, end_date, chunksize=chunksize, calendar=calendar)
     else:
-        df_resolved = df
-        df_assigned = df
-
-    #pu.create_open_and_onhold_contact_chart(df, prs, output_folder)
-    pu.create_resolved_items_per_month_slides(df_resolved, prs, output_folder, start_date, end_date)
-    pu.create_resolution_time_by_engineer_slide(df_resolved, prs, output_folder, start_date, end_date)
-    #pu.create_claim_time_summary_slide(df, prs, output_folder)
-    pu.create_claim_time_summary_table_slide(df_assigned, prs, output_folder, start_date, end_date)
-    pu.create_closure_time_summary_table_slide(df_resolved, prs, output_folder, start_date, end_date)
-    pu.save_exit(prs, "PEA_Contact_Log_Report", "", output_folder)
-
-def engineering_review_board_presentation(project_csv, output_folder):
-    df_first = du.create_blank_dataframe(project_csv)
-    df = du.filter_by_lead_team(df_first)
+        df = du.load_dataframe(contact_csv)
+        summary = du.summarise_contact_log(df, selected_names, start_date, end_date, calendar)
+
+    cache.open_chart_image_cache(output_folder)
+    # The pictures of the matplotlib charts are drawn in worker processes while the deck is built
+    charts = pu.chart_image_specs([
+        ('resolved_items_per_month', summary['resolved_per_month'], None),
+        ('engineer_grouped_resolved_items', summary['resolved_per_month'], None),
+        ('resolution_time', summary['resolution_time'], None),
+    ])
+    with render_chart_images(charts, workers) as images:
+        prs = pu.create_blank_presentation(resource_path(const.FILE_LOCATIONS['pptx_template']))
+
+        #pu.create_open_and_onhold_contact_chart(df, prs, output_folder)
+        pu.create_resolved_items_per_month_chart_slide(summary['resolved_per_month'], prs, output_folder, chart_image=images.get('resolved_items_per_month'))
+        pu.create_engineer_grouped_resolved_items_chart_slide(summary['resolved_per_month'], prs, output_folder, chart_image=images.get('engineer_grouped_resolved_items'))
+        pu.create_resolution_time_chart_slide(summary['resolution_time'], prs, output_folder, chart_image=images.get('resolution_time'))
+        #pu.create_claim_time_summary_slide(df, prs, output_folder)
+        pu.create_claim_time_table_slide(summary['claim_summary'], prs)
+        pu.create_closure_time_table_slide(summary['closure_summary'], prs)
+    cache.flush_chart_image_cache()
+    pu.save_exit(prs, "PEA_Contact_Log_Report", "", output_folder, save_profile=save_profile)
+
+def engineering_review_board_presentation(project_csv, output_folder, save_profile=None):
+    df = du.load_lead_team_dataframe(project_csv)
     prs = pu.create_blank_presentation(resource_path(const.FILE_LOCATIONS['pptx_template']))
     pu.create_New_slides(df, prs)
     # TODO:
@@ -47,98 +137,93 @@ def engineering_review_board_presentation(project_csv, output_folder):
     # PROJECT STATUS CHANGES
         # REVIEW AND APPROVE STATUS CHANGES
         # DISCUSS TIMELINE ADJUSTMENTS & BUDGET IMPACTS
-    pu.save_exit(prs, "PEA_Project_Review_Call_Report", "", output_folder)
+    pu.save_exit(prs, "PEA_Project_Review_Call_Report", "", output_folder, save_profile=save_profile)
 
-def engineering_presentation(project_csv, output_folder):
-    count = 0
-    for eng in const.ENGINEERS:
-        person_filter(project_csv=project_csv, person=eng, output_folder=output_folder)
-        count += 1
-    for rtl in const.RTL:
-        person_filter(project_csv=project_csv, person=rtl, output_folder=output_folder)
-        count += 1
-    return count
+def engineering_presentation(project_csv, output_folder, workers=None, save_profile=None):
+    df = du.load_lead_team_dataframe(project_csv)
+    people = list(const.ENGINEERS) + list(const.RTL)
+    render_decks(df, [(person_filter, {'person': person, 'output_folder': output_folder, 'save_profile': save_profile}) for person in people], workers)
+    return len(people)
 
-def impact_presentation(project_csv, impact_filter, output_folder):
+def impact_presentation(project_csv, impact_filter, output_folder, workers=None, save_profile=None):
     count = 0
     if isinstance(impact_filter, list):
-        for filter_item in impact_filter:
-            impact_slides(project_csv=project_csv, filter=filter_item, output_folder=output_folder)
-            count += 1
+        df = du.load_lead_team_dataframe(project_csv)
+        render_decks(df, [(impact_deck, {'team': filter_item, 'output_folder': output_folder, 'save_profile': save_profile}) for filter_item in impact_filter], workers)
+        count += len(impact_filter)
     else:
-        impact_slides(project_csv=project_csv, filter=impact_filter, output_folder=output_folder)
+        impact_slides(project_csv=project_csv, filter=impact_filter, output_folder=output_folder, workers=workers, save_profile=save_profile)
         count += 1
     return count
 
-def allimpacted_presentation(project_csv, output_folder):
-    allimpacted(project_csv=project_csv, output_folder=output_folder)
+def allimpacted_presentation(project_csv, output_folder, save_profile=None):
+    allimpacted(project_csv=project_csv, output_folder=output_folder, save_profile=save_profile)
 
-def who_presentation(project_csv, name_filter, output_folder):
-    person_filter(project_csv=project_csv, person=name_filter, output_folder=output_folder)
+def who_presentation(project_csv, name_filter, output_folder, save_profile=None):
+    person_filter(project_csv=project_csv, person=name_filter, output_folder=output_folder, save_profile=save_profile)
 
-def onhold_presentation(project_csv, output_folder):
-    df_first = du.create_blank_dataframe(project_csv)
-    df = du.filter_by_lead_team(df_first)
+def onhold_presentation(project_csv, output_folder, save_profile=None):
+    df = du.load_lead_team_dataframe(project_csv)
     prs = pu.create_blank_presentation(resource_path(const.FILE_LOCATIONS['pptx_template']))
     pu.create_OnHold_slides(df, prs, no_section=True)
-    pu.save_exit(prs, "PEA_Project_Report", "_OnHold", output_folder)
+    pu.save_exit(prs, "PEA_Project_Report", "_OnHold", output_folder, save_profile=save_profile)
 
-def objective_presentation(project_csv, output_folder):
-    objective(project_csv=project_csv, output_folder=output_folder)
+def objective_presentation(project_csv, output_folder, save_profile=None):
+    objective(project_csv=project_csv, output_folder=output_folder, save_profile=save_profile)
 
-def projects_presentation(project_csv, output_folder):
-    df_first = du.create_blank_dataframe(project_csv)
-    df = du.filter_by_lead_team(df_first)
+def projects_presentation(project_csv, output_folder, save_profile=None):
+    cache.open_html_text_cache(output_folder)
+    df = du.load_lead_team_dataframe(project_csv)
     prs = pu.create_blank_presentation(resource_path(const.FILE_LOCATIONS['pptx_template']))
     pu.create_project_section(df, prs)
-    pu.save_exit(prs, "PEA_Project_Report", "_Projects", output_folder)
+    cache.flush_html_text_cache()
+    pu.save_exit(prs, "PEA_Project_Report", "_Projects", output_folder, save_profile=save_profile)
 
-def docs_presentation(document_csv, date_filter, output_folder):
-    all_docs(document_csv=document_csv, name_filter=date_filter, output_folder=output_folder)
+def docs_presentation(document_csv, date_filter, output_folder, save_profile=None):
+    all_docs(document_csv=document_csv, name_filter=date_filter, output_folder=output_folder, save_profile=save_profile)
 
-def document_changes_presentation(document_csv, output_folder):
-    doc_changes(document_csv=document_csv, output_folder=output_folder)
+def document_changes_presentation(document_csv, output_folder, save_profile=None):
+    doc_changes(document_csv=document_csv, output_folder=output_folder, save_profile=save_profile)
 
-def output_all_presentation(project_csv, output_folder):
-    output_all(project_csv=project_csv, output_folder=output_folder)
+def output_all_presentation(project_csv, output_folder, save_profile=None):
+    output_all(project_csv=project_csv, output_folder=output_folder, save_profile=save_profile)
 
-def release_presentation(document_csv, release_group, internal, output_folder):
+def release_presentation(document_csv, release_group, internal, output_folder, save_profile=None):
     if release_group == "BDUK":
-        release_board_slides_multi_filter(document_csv=document_csv, filter=["BDUK - P1", "BDUK - P2", "BDUK - P3", "BDUK - P4"], internal=internal, output_folder=output_folder)
+        release_board_slides_multi_filter(document_csv=document_csv, filter=["BDUK - P1", "BDUK - P2", "BDUK - P3", "BDUK - P4"], internal=internal, output_folder=output_folder, save_profile=save_profile)
     else:
-        release_board_slides(document_csv=document_csv, filter=release_group, internal=internal, output_folder=output_folder)
+        release_board_slides(document_csv=document_csv, filter=release_group, internal=internal, output_folder=output_folder, save_profile=save_profile)
 
-def person_filter(project_csv, output_folder, person='Matt', save=True, prs=None):
-    df_first = du.create_blank_dataframe(project_csv)
-    df = du.filter_by_lead_team(df_first)
+def person_filter(project_csv, output_folder, person='Matt', save=True, prs=None, save_profile=None):
+    df = du.load_lead_team_dataframe(project_csv)
     if prs is None:
         prs = pu.create_blank_presentation(resource_path(const.FILE_LOCATIONS['pptx_template']))
     pu.create_ProjectOwner_slides(df, prs, person)
     pu.create_Objective_slides(df, prs, person)
     output_path = ""
     if save:
-        output_path = pu.save_exit(prs, "PEA_Project_Report", "_"+person, output_folder)
+        output_path = pu.save_exit(prs, "PEA_Project_Report", "_"+person, output_folder, save_profile=save_profile)
     return output_path
 
-def impact_slides(project_csv, output_folder, filter=""):
-    df_first = du.create_blank_dataframe(project_csv)
-    df = du.filter_by_lead_team(df_first)
-    impacted = du.impacted_teams_list(df)
+def impact_deck(df, team, output_folder, save_profile=None):
+    # One team's deck, built from the already loaded project DataFrame and its team index
+    prs = pu.create_blank_presentation(resource_path(const.FILE_LOCATIONS['pptx_template']))
+    pu.create_Impacted_section(df, prs, no_section=True, impacted_team=team)
+    return pu.save_exit(prs, "PEA_Project_Report", "_"+team, output_folder, save_profile=save_profile)
+
+def impact_slides(project_csv, output_folder, filter="", workers=None, save_profile=None):
+    df = du.load_lead_team_dataframe(project_csv)
     output_path = ""
     if filter == "":
-        for imp in impacted:
-            prs = pu.create_blank_presentation(resource_path(const.FILE_LOCATIONS['pptx_template']))
-            pu.create_Impacted_section(df, prs, no_section=True, impacted_team=imp)
-            pu.save_exit(prs, "PEA_Project_Report", "_"+imp, output_folder)
+        # One deck per team
+        impacted = du.impacted_teams_list(df)
+        render_decks(df, [(impact_deck, {'team': imp, 'output_folder': output_folder, 'save_profile': save_profile}) for imp in impacted], workers)
     else:
-        prs = pu.create_blank_presentation(resource_path(const.FILE_LOCATIONS['pptx_template']))
-        pu.create_Impacted_section(df, prs, no_section=True, impacted_team=filter)
-        output_path = pu.save_exit(prs, "PEA_Project_Report", "_"+filter, output_folder)
+        output_path = impact_deck(df, filter, output_folder, save_profile=save_profile)
     return output_path
 
-def allimpacted(project_csv, output_folder, save=True, prs=None):
-    df_first = du.create_blank_dataframe(project_csv)
-    df = du.filter_by_lead_team(df_first)
+def allimpacted(project_csv, output_folder, save=True, prs=None, save_profile=None):
+    df = du.load_lead_team_dataframe(project_csv)
     impacted = du.impacted_teams_list(df)
     if prs is None:
         prs = pu.create_blank_presentation(resource_path(const.FILE_LOCATIONS['pptx_template']))
@@ -146,23 +231,21 @@ def allimpacted(project_csv, output_folder, save=True, prs=None):
     for imp in impacted:
         pu.create_Impacted_section(df, prs, no_section=True, impacted_team=imp)
     if save:
-        output_path = pu.save_exit(prs, "PEA_Project_Report", "_AllImpacts", output_folder)
+        output_path = pu.save_exit(prs, "PEA_Project_Report", "_AllImpacts", output_folder, save_profile=save_profile)
     return output_path
 
-def objective(project_csv, output_folder, save=True, prs=None):
-    df_first = du.create_blank_dataframe(project_csv)
-    df = du.filter_by_lead_team(df_first)
+def objective(project_csv, output_folder, save=True, prs=None, save_profile=None):
+    df = du.load_lead_team_dataframe(project_csv)
     if prs is None:
         prs = pu.create_blank_presentation(resource_path(const.FILE_LOCATIONS['pptx_template']))
     pu.create_Objective_slides(df, prs)
     output_path = ""
     if save:
-        output_path = pu.save_exit(prs, "PEA_Project_Report", "_Objective", output_folder)
+        output_path = pu.save_exit(prs, "PEA_Project_Report", "_Objective", output_folder, save_profile=save_profile)
     return output_path
 
-def output_all(project_csv, output_folder, save=True, prs=None):
-    df_first = du.create_blank_dataframe(project_csv)
-    df = du.filter_by_lead_team(df_first)
+def output_all(project_csv, output_folder, save=True, prs=None, save_profile=None):
+    df = du.load_lead_team_dataframe(project_csv)
     if prs is None:
         prs = pu.create_blank_presentation(resource_path(const.FILE_LOCATIONS['pptx_template']))
     pu.create_AllProjects_slide(df, prs)
@@ -175,34 +258,36 @@ def output_all(project_csv, output_folder, save=True, prs=None):
         pu.create_Impacted_section(df, prs, no_section=True, impacted_team=imp)
     pu.create_OnHold_slides(df, prs)
     if save:
-        output_path = pu.save_exit(prs, report_type="PEA_Project_Report", folder = output_folder)
+        output_path = pu.save_exit(prs, report_type="PEA_Project_Report", folder = output_folder, save_profile=save_profile)
     return output_path
 
-def all_docs(document_csv, output_folder, name_filter='', save=True, prs=None):
-    df_first = du.create_blank_dataframe(document_csv)
-    df = du.filter_by_lead_team(df_first)
+def all_docs(document_csv, output_folder, name_filter='', save=True, prs=None, save_profile=None):
+    cache.open_html_text_cache(output_folder)
+    df = du.load_lead_team_dataframe(document_csv)
     if prs is None:
         prs = pu.create_blank_presentation(resource_path(const.FILE_LOCATIONS['pptx_template']))
     pu.create_document_release_section(df, prs, name_filter)
     output_path = ""
+    cache.flush_html_text_cache()
     if save:
-        output_path = pu.save_exit(prs, "PEA_Project_Report", "_DocumentBoard", folder = output_folder)
+        output_path = pu.save_exit(prs, "PEA_Project_Report", "_DocumentBoard", folder = output_folder, save_profile=save_profile)
     return output_path
 
-def doc_changes(document_csv, output_folder, save=True, prs=None):
-    df_first = du.create_blank_dataframe(document_csv)
-    df = du.filter_by_lead_team(df_first)
+def doc_changes(document_csv, output_folder, save=True, prs=None, save_profile=None):
+    cache.open_html_text_cache(output_folder)
+    df = du.load_lead_team_dataframe(document_csv)
     if prs is None:
         prs = pu.create_blank_presentation(resource_path(const.FILE_LOCATIONS['pptx_template']))
     pu.create_document_changes_section(df, prs)
     output_path = ""
+    cache.flush_html_text_cache()
     if save:
-        output_path = pu.save_exit(prs, "PEA_Project_Report", "_DocumentChanges", folder = output_folder)
+        output_path = pu.save_exit(prs, "PEA_Project_Report", "_DocumentChanges", folder = output_folder, save_profile=save_profile)
     return output_path
 
-def release_board_slides(document_csv, output_folder, filter='', save=True, prs=None, internal=False):
-    df_first = du.create_blank_dataframe(document_csv)
-    df = du.filter_by_lead_team(df_first)
+def release_board_slides(document_csv, output_folder, filter='', save=True, prs=None, internal=False, save_profile=None):
+    cache.open_html_text_cache(output_folder)
+    df = du.load_lead_team_dataframe(document_csv)
     save_tail = "_FullReleaseBoard"
     if filter:
         df = df.loc[df['Release Group'] == filter]   
@@ -219,9 +304,6 @@ def release_board_slides(document_csv, output_folder, filter='', save=True, prs=
     pu.create_document_release_section(df, prs, filter, internal=internal)
     pu.create_title_slide(prs, f'Release Urgency')
     pu.create_document_release_section_commercial_impacts(df, prs, filter, internal=internal)
-    
-    #TODO: Have slides split over multiple pages depending on the number of buttons
-    #TODO: Have slides merge to single if small enough number of buttons
 
     output_path = ""
     
@@ -229,14 +311,15 @@ def release_board_slides(document_csv, output_folder, filter='', save=True, prs=
     if not internal:
         for imp in impacted:
             pu.create_document_Impacted_section(df, prs, no_section=False, impacted_team=imp, group_filter=filter)
+    cache.flush_html_text_cache()
     if save:
-        output_path = pu.save_exit(prs, "PEA_Document_Release", save_tail, folder = output_folder)
+        output_path = pu.save_exit(prs, "PEA_Document_Release", save_tail, folder = output_folder, save_profile=save_profile)
 
     return output_path
 
-def release_board_slides_multi_filter(document_csv, output_folder, filter='[]', save=True, prs=None, internal=False):
-    df_first = du.create_blank_dataframe(document_csv)
-    df = du.filter_by_lead_team(df_first)
+def release_board_slides_multi_filter(document_csv, output_folder, filter='[]', save=True, prs=None, internal=False, save_profile=None):
+    cache.open_html_text_cache(output_folder)
+    df = du.load_lead_team_dataframe(document_csv)
     save_tail = "_FullReleaseBoard"
     if filter:
         df = df[df['Release Group'].isin(filter)]    
@@ -252,7 +335,8 @@ def release_board_slides_multi_filter(document_csv, output_folder, filter='[]',
     if not internal:
         for imp in impacted:
             pu.create_document_Impacted_section_multi_filter(df, prs, no_section=False, impacted_team=imp, group_filter=filter)
+    cache.flush_html_text_cache()
     if save:
-        output_path = pu.save_exit(prs, "PEA_Document_Release", save_tail, folder = output_folder)
+        output_path = pu.save_exit(prs, "PEA_Document_Release", save_tail, folder = output_folder, save_profile=save_profile)
 
     return output_path
\ No newline at end of file
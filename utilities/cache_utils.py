@@ -0,0 +1,240 @@
+import atexit
+import hashlib
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+import utilities.constants as const
+
+# The cache store opened for the current output folder, see open_html_text_cache
+_HTML_TEXT_CACHE = None
+
+def content_key(text):
+    """
+    Content address of a string, the SHA-1 hex digest of its UTF-8 bytes.
+    """
+    return hashlib.sha1(text.encode('utf-8', 'surrogatepass')).hexdigest()
+
+def frame_key(df, *parts):
+    """
+    Content address of a DataFrame and the parameters it is used with, the SHA-1 hex digest of its
+    column names, dtypes, index and values followed by the repr of the parts.
+    """
+    digest = hashlib.sha1()
+    digest.update(repr((list(df.columns), [str(dtype) for dtype in df.dtypes], list(df.index.names))).encode('utf-8', 'surrogatepass'))
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    digest.update(repr(parts).encode('utf-8', 'surrogatepass'))
+    return digest.hexdigest()
+
+class _EntryStore:
+    """
+    SQLite table of values keyed by a content hash, kept between runs.
+
+    Lookups are answered from the database, new entries and the last-used stamps of hits are
+    buffered and written by flush(). Entries are dropped when the version stamp changes, and
+    the least recently used ones are evicted once there are more than max_entries.
+
+    Parameters:
+    - path (str): The SQLite database file, created if it does not exist.
+    - version (str): Stamp of the logic the entries were produced with.
+    - max_entries (int): Number of entries kept.
+    """
+    # Name and SQLite type of the column holding the values
+    VALUE_COLUMN = ('value', 'BLOB')
+
+    def __init__(self, path, version, max_entries):
+        self.path = path
+        self.max_entries = max_entries
+        self.pending = {}
+        self.used = set()
+
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute('CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, %s %s NOT NULL, used REAL NOT NULL)' % self.VALUE_COLUMN)
+        self.connection.execute('CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)')
+
+        # Entries written by another version of the logic are no longer valid
+        row = self.connection.execute("SELECT value FROM meta WHERE name = 'version'").fetchone()
+        if row is None or row[0] != str(version):
+            self.connection.execute('DELETE FROM entries')
+            self.connection.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (str(version),))
+        self.connection.commit()
+
+    def lookup(self, key):
+        if key in self.pending:
+            return self.pending[key]
+        row = self.connection.execute('SELECT %s FROM entries WHERE key = ?' % self.VALUE_COLUMN[0], (key,)).fetchone()
+        if row is None:
+            return None
+        self.used.add(key)
+        return row[0]
+
+    def store(self, key, value):
+        self.pending[key] = value
+
+    def flush(self):
+        if not self.pending and not self.used:
+            return
+        now = time.time()
+        with self.connection:
+            self.connection.executemany('INSERT OR REPLACE INTO entries VALUES (?, ?, ?)', [(key, value, now) for key, value in self.pending.items()])
+            self.connection.executemany('UPDATE entries SET used = ? WHERE key = ?', [(now, key) for key in self.used])
+            self.connection.execute('DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY used DESC LIMIT -1 OFFSET ?)', (self.max_entries,))
+        self.pending = {}
+        self.used = set()
+
+    def close(self):
+        self.flush()
+        self.connection.close()
+
+class TextCache(_EntryStore):
+    """
+    SQLite store of converted text keyed by a hash of the source text, kept between runs, see _EntryStore.
+    """
+    VALUE_COLUMN = ('text', 'TEXT')
+
+    def get(self, source):
+        return self.lookup(content_key(source))
+
+    def put(self, source, text):
+        self.store(content_key(source), text)
+
+class ImageStore(_EntryStore):
+    """
+    SQLite store of rendered chart images, as PNG (or other image format) bytes keyed by a frame_key,
+    kept between runs, see _EntryStore.
+    """
+    VALUE_COLUMN = ('image', 'BLOB')
+
+def open_html_text_cache(output_folder):
+    """
+    Open the cleaned HTML text cache stored in the output folder, used by
+    data_utils.convert_html_to_text_with_newlines until another folder's cache is opened.
+
+    Parameters:
+    - output_folder (str): The report output folder, the cache is kept in its const.CACHE_FOLDER sub folder.
+
+    Returns:
+    - TextCache: The open cache.
+    """
+    global _HTML_TEXT_CACHE
+    path = os.path.join(output_folder, const.CACHE_FOLDER, const.HTML_TEXT_CACHE_FILE)
+    if _HTML_TEXT_CACHE is not None:
+        if _HTML_TEXT_CACHE.path == path:
+            return _HTML_TEXT_CACHE
+        _HTML_TEXT_CACHE.close()
+    _HTML_TEXT_CACHE = TextCache(path, const.HTML_TEXT_VERSION, const.HTML_TEXT_CACHE_MAX_ENTRIES)
+    return _HTML_TEXT_CACHE
+
+def html_text_cache():
+    """
+    The open cleaned HTML text cache, or None if open_html_text_cache has not been called.
+    """
+    return _HTML_TEXT_CACHE
+
+def flush_html_text_cache():
+    """
+    Write the entries added to the open cleaned HTML text cache to disk.
+    """
+    if _HTML_TEXT_CACHE is not None:
+        _HTML_TEXT_CACHE.flush()
+
+class ChartImageCache:
+    """
+    Rendered chart images keyed by the frame_key of the plotted data, plot function and style.
+
+    The max_entries most recently used images are kept in memory. With a path, images missing from
+    memory are looked up in the ImageStore there and new ones are added to it, so they are kept
+    between runs. The store is only created once an image is added to it.
+
+    Parameters:
+    - max_entries (int): Number of images kept in memory.
+    - path (str, optional): The SQLite file the images are persisted in.
+    """
+    def __init__(self, max_entries, path=None):
+        self.max_entries = max_entries
+        self.path = path
+        self.store = None
+        self.images = OrderedDict()
+
+    def get(self, key):
+        if key in self.images:
+            self.images.move_to_end(key)
+            return self.images[key]
+        # An existing store is opened to look the image up, a missing one is not created for it
+        store = self._open_store() if self.path and os.path.exists(self.path) else self.store
+        image = store.lookup(key) if store is not None else None
+        if image is not None:
+            self._remember(key, image)
+        return image
+
+    def put(self, key, image):
+        self._remember(key, image)
+        if self.path:
+            self._open_store().store(key, image)
+
+    def set_path(self, path):
+        # Persist the images in another file from now on
+        if path == self.path:
+            return
+        self.close()
+        self.path = path
+
+    def flush(self):
+        if self.store is not None:
+            self.store.flush()
+
+    def close(self):
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+
+    def _open_store(self):
+        if self.store is None:
+            self.store = ImageStore(self.path, const.CHART_IMAGE_VERSION, const.CHART_IMAGE_CACHE_MAX_ENTRIES)
+        return self.store
+
+    def _remember(self, key, image):
+        self.images[key] = image
+        self.images.move_to_end(key)
+        while len(self.images) > self.max_entries:
+            self.images.popitem(last=False)
+
+# In-memory until open_chart_image_cache gives it a file in an output folder
+_CHART_IMAGE_CACHE = ChartImageCache(const.CHART_IMAGE_CACHE_SIZE)
+
+def open_chart_image_cache(output_folder):
+    """
+    Persist the chart image cache in the output folder, used by presentation_utils.render_chart_image.
+    The file is only created once a chart image is drawn. Without const.CHART_IMAGE_CACHE_FILE the
+    images are only kept in memory.
+
+    Parameters:
+    - output_folder (str): The report output folder, the images are kept in its const.CACHE_FOLDER sub folder.
+
+    Returns:
+    - ChartImageCache: The chart image cache.
+    """
+    if const.CHART_IMAGE_CACHE_FILE:
+        _CHART_IMAGE_CACHE.set_path(os.path.join(output_folder, const.CACHE_FOLDER, const.CHART_IMAGE_CACHE_FILE))
+    return _CHART_IMAGE_CACHE
+
+def chart_image_cache():
+    """
+    The chart image cache, persisted in the folder last passed to open_chart_image_cache.
+    """
+    return _CHART_IMAGE_CACHE
+
+def flush_chart_image_cache():
+    """
+    Write the images added to the chart image cache to disk, if it is persisted.
+    """
+    _CHART_IMAGE_CACHE.flush()
+
+atexit.register(flush_html_text_cache)
+atexit.register(flush_chart_image_cache)
@@ -0,0 +1,142 @@
+from pptx.chart.data import CategoryChartData
+from pptx.dml.color import RGBColor
+from pptx.enum.chart import XL_CHART_TYPE, XL_LEGEND_POSITION, XL_LABEL_POSITION
+from pptx.util import Pt
+
+import utilities.constants as const
+
+# Native PowerPoint charts, built from the aggregated contact log frames. They are drawn by PowerPoint
+# itself, so nothing is rasterised, the decks stay small and the charts can still be edited.
+# Each add_* function mirrors the graph_utils plot of the same data, title included.
+
+# Colour graph_utils uses for single series bar charts (matplotlib's 'skyblue')
+SINGLE_SERIES_COLOUR = RGBColor(0x87, 0xCE, 0xEB)
+
+def add_category_chart(slide, chart_type, categories, series, title=None):
+    """
+    Add a native chart to a slide, in the area pictures of charts are placed in by presentation_utils.insert_chart_into_slide.
+
+    Parameters:
+    - slide (Slide): The slide to add the chart to.
+    - chart_type (XL_CHART_TYPE): The kind of chart, e.g. XL_CHART_TYPE.COLUMN_STACKED.
+    - categories (list): The category labels.
+    - series (dict): The values of each series, one per category, keyed by the series name.
+    - title (str, optional): The chart title, none is shown without one.
+
+    Returns:
+    - Chart: The new chart.
+    """
+    chart_data = CategoryChartData()
+    chart_data.categories = [str(category) for category in categories]
+    for name, values in series.items():
+        chart_data.add_series(str(name), [float(value) for value in values])
+
+    area = const.CHART_AREA
+    graphic_frame = slide.shapes.add_chart(chart_type, area['left'], area['top'], area['width'], area['height'], chart_data)
+    chart = graphic_frame.chart
+    chart.font.size = Pt(12)
+    chart.has_title = bool(title)
+    if title:
+        chart.chart_title.text_frame.text = title
+    return chart
+
+def _set_axis_title(axis, title):
+    if title:
+        axis.has_title = True
+        axis.axis_title.text_frame.text = title
+
+def _set_legend(chart):
+    # Legend to the right of the plot, as in the matplotlib charts
+    chart.has_legend = True
+    chart.legend.position = XL_LEGEND_POSITION.RIGHT
+    chart.legend.include_in_layout = False
+
+def _fill_single_series(chart):
+    fill = chart.plots[0].series[0].format.fill
+    fill.solid()
+    fill.fore_color.rgb = SINGLE_SERIES_COLOUR
+
+def add_resolved_items_per_month_chart(slide, df):
+    """
+    Stacked column chart of the number of resolved items per month, one series per engineer.
+
+    df: DataFrame with the columns ['Closed by', 'YearMonth', 'ResolvedCount'].
+    """
+    pivot_table = df.pivot(index='YearMonth', columns='Closed by', values='ResolvedCount').fillna(0)
+    chart = add_category_chart(slide, XL_CHART_TYPE.COLUMN_STACKED, pivot_table.index,
+                               {engineer: pivot_table[engineer] for engineer in pivot_table.columns},
+                               title='Resolved Items Per Month (Closed by)')
+    chart.plots[0].gap_width = 50
+    _set_axis_title(chart.category_axis, 'Month')
+    _set_axis_title(chart.value_axis, 'Number of Resolved Items')
+    _set_legend(chart)
+    return chart
+
+def add_grouped_resolved_items_per_month_chart(slide, df):
+    """
+    Clustered column chart of the number of resolved items per month, one series per engineer.
+
+    df: DataFrame with the columns ['Closed by', 'YearMonth', 'ResolvedCount'].
+    """
+    pivot_table = df.pivot(index='YearMonth', columns='Closed by', values='ResolvedCount').fillna(0)
+    chart = add_category_chart(slide, XL_CHART_TYPE.COLUMN_CLUSTERED, pivot_table.index,
+                               {engineer: pivot_table[engineer] for engineer in pivot_table.columns})
+    _set_legend(chart)
+    return chart
+
+def add_engineer_grouped_resolved_items_chart(slide, df):
+    """
+    Clustered column chart of the number of resolved items per engineer, one series per month.
+
+    df: DataFrame with the columns ['Closed by', 'YearMonth', 'ResolvedCount'].
+    """
+    pivot_table = df.pivot(index='Closed by', columns='YearMonth', values='ResolvedCount').fillna(0)
+    chart = add_category_chart(slide, XL_CHART_TYPE.COLUMN_CLUSTERED, pivot_table.index,
+                               {month: pivot_table[month] for month in pivot_table.columns})
+    _set_axis_title(chart.value_axis, 'Number of Tickets Closed')
+    _set_legend(chart)
+    return chart
+
+def add_resolution_time_chart(slide, df):
+    """
+    Horizontal bar chart of the average resolution time per engineer, longest first, labelled in days.
+
+    df: DataFrame with the columns ['Closed by', 'TimeToResolve_BusinessDays'].
+    """
+    grouped_df = df.groupby('Closed by')['TimeToResolve_BusinessDays'].mean().reset_index()
+    grouped_df = grouped_df.sort_values(by='TimeToResolve_BusinessDays', ascending=False)
+
+    chart = add_category_chart(slide, XL_CHART_TYPE.BAR_CLUSTERED, grouped_df['Closed by'],
+                               {'Average Resolution Time': grouped_df['TimeToResolve_BusinessDays']})
+    # Bar charts are drawn bottom up, reversed to have the longest bar on top
+    chart.category_axis.reverse_order = True
+    _set_axis_title(chart.value_axis, 'Average Resolution Time in Business Days')
+    _fill_single_series(chart)
+
+    plot = chart.plots[0]
+    plot.has_data_labels = True
+    plot.data_labels.number_format = '0.0" days"'
+    plot.data_labels.number_format_is_linked = False
+    plot.data_labels.position = XL_LABEL_POSITION.OUTSIDE_END
+    return chart
+
+def add_age_bar_chart(slide, df):
+    """
+    Horizontal bar chart of the total age of open tickets per assignee, labelled with their number of tickets.
+
+    df: DataFrame with the columns ['AssignedTo', 'Age_BusinessDays', 'TicketCount'].
+    """
+    chart = add_category_chart(slide, XL_CHART_TYPE.BAR_CLUSTERED, df['AssignedTo'],
+                               {'Total Age in Business Days': df['Age_BusinessDays']},
+                               title='Total Age of Open Tickets by Assigned Person')
+    chart.category_axis.reverse_order = True
+    _set_axis_title(chart.value_axis, 'Total Age in Business Days')
+    _set_axis_title(chart.category_axis, 'Assigned To')
+    _fill_single_series(chart)
+
+    series = chart.plots[0].series[0]
+    for index, count in enumerate(df['TicketCount']):
+        data_label = series.points[index].data_label
+        data_label.text_frame.text = f'{count} tickets'
+        data_label.position = XL_LABEL_POSITION.OUTSIDE_END
+    return chart
@@ -1,3 +1,4 @@
+import zipfile
 from pptx.util import Pt, Cm
 from pptx.enum.dml import MSO_THEME_COLOR
 
@@ -30,7 +31,125 @@ FILE_LOCATIONS = {
     'concession_csv': './raw/CONCESSION.csv',
     'pptx_template': './templates/_template.pptx',
     'output_folder': './output/',
+    'holidays_file': './raw/HOLIDAYS.txt',
 }
+
+# Maximum number of parsed datasets kept in memory by data_utils.load_dataframe
+DATASET_CACHE_MAX_ENTRIES = 8
+
+# Column that identifies each report family in a SharePoint export (checked in this order)
+REPORT_FAMILY_MARKERS = {
+    'project': 'Project Updates',
+    'contact': 'ContactType',
+    'document': 'Doc Reference',
+}
+
+# Columns loaded for each report family - None keeps pandas' type inference, 'category' stores repeated labels once
+# and 'datetime' parses day-first date strings once at load time
+PROJECT_SCHEMA = {
+    'ID': None,
+    'Title': None,
+    'Objective': None,
+    'Primary Owner': None,
+    'Project Summary': None,
+    'Closure Comments': None,
+    'Impacted Teams': None,
+    'Project Updates': None,
+    'Project Actions': None,
+    'Status': 'category',
+    'Staging': 'category',
+    'Priority': 'category',
+    'Lead Team': 'category',
+}
+
+DOCUMENT_SCHEMA = {
+    'Doc Reference': None,
+    'Title': None,
+    'Primary Owner': None,
+    'Release Text': None,
+    'Release Urgency': None,
+    'Release Forecast': None,
+    'Impact': None,
+    'Impacted Teams': None,
+    'Status': 'category',
+    'Release Group': 'category',
+    'Lead Team': 'category',
+}
+
+CONTACT_SCHEMA = {
+    'ContactType': 'category',
+    'Title': None,
+    'RaisedBy': 'category',
+    'OriginalCreationDate': 'datetime',
+    'Claimed?': 'category',
+    'Claimed Date': 'datetime',
+    'Completed Time': 'datetime',
+    'Closed by': None,
+    'AssignedTo': None,
+    'Status': 'category',
+}
+
+REPORT_SCHEMAS = {
+    'project': PROJECT_SCHEMA,
+    'document': DOCUMENT_SCHEMA,
+    'contact': CONTACT_SCHEMA,
+}
+
+# Format of the date columns in the exports, e.g. '%d/%m/%Y %H:%M'. None infers it from the data
+DATE_FORMAT = None
+
+# Format dates are shown in on the slide cards, the day-first format of the exports
+CARD_DATE_FORMAT = '%d/%m/%Y %H:%M'
+
+# Working days (Monday to Sunday) and hours used to age tickets, see calendar_utils.BusinessCalendar
+BUSINESS_WEEKMASK = '1111100'
+BUSINESS_HOURS = ('09:00', '17:00')
+
+# Worker processes building the decks of a batch (one per engineer or team). 1 builds them one after another in
+# the running process, more are opted into with --workers or the GUI's Workers box. None uses one per CPU
+BATCH_WORKERS = 1
+
+# Worker processes drawing the matplotlib charts of a deck, see builder.render_chart_images. None uses one per CPU
+CHART_WORKERS = None
+
+# How presentation_utils.save_exit compresses the saved decks. 'draft' trades some file size for a faster save
+# (intermediate decks, large batches), 'store' skips compression altogether (fastest, for local disks),
+# 'standard' is the deck as python-pptx saves it, matching PowerPoint's usual output, and 'final' gives the smallest files
+SAVE_PROFILES = {
+    'draft': {'compression': zipfile.ZIP_DEFLATED, 'compresslevel': 1},
+    'store': {'compression': zipfile.ZIP_STORED, 'compresslevel': None},
+    'standard': None,
+    'final': {'compression': zipfile.ZIP_DEFLATED, 'compresslevel': 9},
+}
+DEFAULT_SAVE_PROFILE = 'standard'
+
+# Write buffer used when saving decks, large so saving to a network share takes few writes
+SAVE_BUFFER_SIZE = 1024 * 1024
+
+# Rows per chunk when the contact log is streamed by data_utils.aggregate_contact_log
+CONTACT_CHUNK_SIZE = 100_000
+
+# Number of converted HTML cells (Release Text, Project Updates...) remembered by data_utils.convert_html_to_text_with_newlines
+HTML_TEXT_CACHE_SIZE = 4096
+
+# Cleaned HTML text kept between runs in <output folder>/CACHE_FOLDER/HTML_TEXT_CACHE_FILE, see cache_utils.
+# Bump HTML_TEXT_VERSION whenever data_utils.convert_html_to_text_with_newlines changes its output
+CACHE_FOLDER = '.cache'
+HTML_TEXT_CACHE_FILE = 'html_text.sqlite'
+HTML_TEXT_CACHE_MAX_ENTRIES = 50_000
+HTML_TEXT_VERSION = 1
+
+# Rich-text columns converted up front by data_utils.prerender_html_columns, and the plain text columns they are written to
+PRERENDERED_TEXT_COLUMNS = {
+    'Project Updates': 'Project Updates (Text)',
+    'Project Actions': 'Project Actions (Text)',
+}
+
+# Fewer uncached cells than this are converted in-process, as starting worker processes would cost more
+PRERENDER_MIN_PARALLEL_CELLS = 200
+
+# File extension of the columnar snapshots written next to the CSV exports
+SNAPSHOT_EXTENSION = '.feather'
     
 # Text Representations for Staging
 STAGING_TEXT_REPRESENTATION = {
@@ -158,6 +277,7 @@ FOUR_COL_SLIDE_CONSTANTS = {
     'start_top': Cm(2),
     'horizontal_spacing': Cm(0.2),
     'vertical_spacing': Cm(0.2),
+    'bottom_margin': Cm(0.65),
 }
 
 # Project Button Constants
@@ -199,7 +319,8 @@ THREE_COL_SLIDE_CONSTANTS = {
     'start_left_col3': Cm(14.82),
     'start_left_col4': Cm(24.33),
     'start_top': Cm(3.39),
-    'vertical_spacing': Cm(0.2)
+    'vertical_spacing': Cm(0.2),
+    'bottom_margin': Cm(0.65),
 }
 
 DOC_RELEASE_SLIDE_CONSTANTS = {
@@ -207,14 +328,56 @@ DOC_RELEASE_SLIDE_CONSTANTS = {
     'start_top': Cm(3.87),
     'vertical_spacing': Cm(0.2),
     'horizontal_spacing': Cm(0.2),
+    'bottom_margin': Cm(0.65),
+}
+
+# Area of the chart slides taken by the chart, natively drawn or as a picture
+CHART_AREA = {
+    'left': Cm(1.43),
+    'top': Cm(2.2),
+    'width': Cm(31.0),
+    'height': Cm(15.43),
 }
 
+# How each chart slide draws its chart: 'native' builds an editable PowerPoint chart (chart_utils),
+# 'matplotlib' inserts a picture drawn by graph_utils. The claim time summary is not listed: it has
+# two value axes, which native charts cannot show, so it is always drawn with matplotlib
+CHART_BACKENDS = {
+    'resolved_items_per_month': 'native',
+    'grouped_resolved_items_per_month': 'native',
+    'engineer_grouped_resolved_items': 'native',
+    'resolution_time': 'native',
+    'open_ticket_age': 'native',
+}
+
+# Resolution and format of the chart images drawn by graph_utils
+CHART_IMAGE_DPI = 100
+CHART_IMAGE_FORMAT = 'png'
+
+# Chart images remembered by presentation_utils.render_chart_image: CHART_IMAGE_CACHE_SIZE in memory, and up to
+# CHART_IMAGE_CACHE_MAX_ENTRIES kept between runs in <output folder>/CACHE_FOLDER/CHART_IMAGE_CACHE_FILE (None keeps
+# them in memory only). Bump CHART_IMAGE_VERSION whenever a graph_utils plot changes how it draws its chart
+CHART_IMAGE_CACHE_SIZE = 64
+CHART_IMAGE_CACHE_FILE = 'chart_images.sqlite'
+CHART_IMAGE_CACHE_MAX_ENTRIES = 500
+CHART_IMAGE_VERSION = 1
+
+# Title of the slides a group of buttons continues on when it does not fit on one
+CONTINUATION_TITLE_FORMAT = "{title} – {slide}/{slides}"
+
 THREE_COL_TITLES = {
     'col1': 'Assessing:',
     'col2': 'Testing:',
     'col3': 'Preparing Release:'
 }
 
+# Staging shown under each of the THREE_COL_TITLES columns, stages listed in display order
+THREE_COL_STAGING = {
+    'col1': ['Triage', 'Analysis'],
+    'col2': ['Alpha Test', 'Beta Test'],
+    'col3': ['Roll-out'],
+}
+
 DOC_BOARD_TITLES = {
     'main': 'Technical Releases',
     'new': 'New Documents',
@@ -233,6 +396,12 @@ IMPACT_SYMBOL_MAPPING = {
     "Change to Materials": "E",
 }
 
+# SharePoint list views the project and document buttons link to, filtered on the URL-encoded title
+SHAREPOINT_LINK_FORMATS = {
+    'Project': "https://cityfibreholdings.sharepoint.com/sites/PassiveEngineeringandArchitecture/Lists/Engineering%20Change%20Board/My%20Tickets.aspx?viewid=528f2921%2Db441%2D4617%2D9a90%2D28d029afdd79&FilterField1=LinkTitle&FilterValue1={}&FilterType1=Computed",
+    'Document': "https://cityfibreholdings.sharepoint.com/sites/PassiveEngineeringArchitecture/Lists/Document%20Change%20Log/9%20Report%20Output.aspx?FilterField1=LinkTitle&FilterValue1={}&FilterType1=Computed",
+}
+
 # Functions
 def get_staging_text(staging):
     return STAGING_TEXT_REPRESENTATION.get(staging, "-----")
@@ -1,99 +1,580 @@
 from datetime import datetime, timedelta
+from collections import OrderedDict
 import pandas as pd
 import numpy as np
 from bs4 import BeautifulSoup
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 import html
+import math
+import os
+import re
+import weakref
 from typing import Union, List
 
+from pandas.tseries.api import guess_datetime_format
+
+import utilities.constants as const
+import utilities.calendar_utils as cu
+import utilities.cache_utils as cache
+
+# Parsed datasets shared by every builder in the process, most recently used last
+_DATASET_CACHE = OrderedDict()
+
+# Date formats inferred so far, keyed by the digit pattern of the sample they were inferred from
+_DATE_FORMAT_CACHE = {}
+
+# Row position indexes built for a DataFrame, keyed by (id(df), index name), see _frame_index
+_FRAME_INDEX_CACHE = {}
+
 def create_blank_dataframe(csv_file='./raw/DATA.csv'):
     df = pd.read_csv(csv_file)
     return df
 
+def snapshot_path(csv_file):
+    # Snapshots live next to the CSV export they were converted from, e.g. ./raw/PROJECT.feather
+    return os.path.splitext(csv_file)[0] + const.SNAPSHOT_EXTENSION
+
+def _import_feather():
+    # pyarrow is optional - without it the snapshot layer is silently skipped
+    try:
+        import pyarrow
+        import pyarrow.feather as feather
+    except ImportError:
+        return None, None
+    return pyarrow, feather
+
+def _source_stamp(csv_file):
+    stat = os.stat(csv_file)
+    return {b'source_mtime_ns': str(stat.st_mtime_ns).encode(), b'source_size': str(stat.st_size).encode()}
+
+def write_snapshot(csv_file):
+    """
+    Convert a CSV export into a columnar Feather (Arrow IPC) snapshot stored next to it.
+
+    The snapshot records the modification time and size of the CSV it was built from so it
+    is ignored as soon as the export is replaced.
+
+    Parameters:
+    - csv_file (str): Path to the CSV file.
+
+    Returns:
+    - str: Path of the snapshot, or "" if it could not be written.
+    """
+    pyarrow, feather = _import_feather()
+    if feather is None:
+        print("Warning: pyarrow is not installed, snapshots are disabled.")
+        return ""
+
+    df = create_blank_dataframe(csv_file)
+    try:
+        table = pyarrow.Table.from_pandas(df, preserve_index=False)
+    except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError) as e:
+        print(f"Warning: could not snapshot {csv_file}: {e}")
+        return ""
+
+    metadata = dict(table.schema.metadata or {})
+    metadata.update(_source_stamp(csv_file))
+    table = table.replace_schema_metadata(metadata)
+
+    # Uncompressed so the snapshot can be memory-mapped, written to a temporary file so readers never see half a file
+    path = snapshot_path(csv_file)
+    temp_path = path + '.tmp'
+    feather.write_feather(table, temp_path, compression='uncompressed')
+    os.replace(temp_path, path)
+    return path
+
+def read_snapshot(csv_file, columns=None):
+    """
+    Load the snapshot of a CSV export if one exists and is still fresh.
+
+    Parameters:
+    - csv_file (str): Path to the CSV file the snapshot was built from.
+    - columns (list, optional): Only read these columns. Reads everything if omitted.
+
+    Returns:
+    - pd.DataFrame: The snapshot contents, or None if there is no usable snapshot.
+    """
+    path = snapshot_path(csv_file)
+    if not os.path.exists(path):
+        return None
+
+    pyarrow, feather = _import_feather()
+    if feather is None:
+        return None
+
+    try:
+        table = feather.read_table(path, columns=columns, memory_map=True)
+    except (OSError, pyarrow.ArrowInvalid):
+        return None
+
+    metadata = table.schema.metadata or {}
+    stamp = _source_stamp(csv_file)
+    if any(metadata.get(key) != value for key, value in stamp.items()):
+        return None
+
+    df = table.to_pandas()
+
+    # Arrow gives missing strings back as None, pd.read_csv uses NaN - keep the CSV behaviour
+    for column in df.columns[df.dtypes == object]:
+        df[column] = df[column].where(df[column].notna(), np.nan)
+
+    return df
+
+def detect_report_family(columns):
+    """
+    Work out which SharePoint export a set of columns belongs to.
+
+    Parameters:
+    - columns (Iterable[str]): The column names of the export.
+
+    Returns:
+    - str: 'project', 'contact' or 'document', or None if the export is not recognised.
+    """
+    for family, marker in const.REPORT_FAMILY_MARKERS.items():
+        if marker in columns:
+            return family
+    return None
+
+def read_csv_header(csv_file):
+    # Only the header row is parsed
+    return pd.read_csv(csv_file, nrows=0).columns
+
+def _priority_rank(priority):
+    # 'P1 🔥' -> 1, 'P3' -> 3; anything else sorts after the ranked priorities
+    match = re.match(r'\s*P(\d+)', str(priority))
+    rank = int(match.group(1)) if match else math.inf
+    return (rank, str(priority))
+
+def order_priority(series):
+    """
+    Turn a Priority column into an ordered categorical ranked P1 to P5, so sorting compares ranks rather than emoji strings.
+    """
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype('category')
+    categories = sorted(series.cat.categories, key=_priority_rank)
+    return series.cat.reorder_categories(categories, ordered=True)
+
+def _infer_date_format(series):
+    if const.DATE_FORMAT:
+        return const.DATE_FORMAT
+
+    first = series.first_valid_index()
+    if first is None:
+        return None
+
+    # '20/08/2023 11:41' and '01/02/2024 09:05' share the pattern '00/00/0000 00:00' so are only guessed once
+    sample = str(series.loc[first]).strip()
+    pattern = re.sub(r'\d', '0', sample)
+    if pattern not in _DATE_FORMAT_CACHE:
+        _DATE_FORMAT_CACHE[pattern] = guess_datetime_format(sample, dayfirst=True)
+    return _DATE_FORMAT_CACHE[pattern]
+
+def parse_dates(series):
+    """
+    Parse a column of day-first date strings (as exported by SharePoint) into datetime64 values.
+
+    The format is inferred once from the first value and cached, then the whole column is parsed with it.
+    Values in another format (e.g. a date without a time in a timestamp column) are parsed one by one,
+    and only values that cannot be parsed at all become NaT. Columns that are already datetime64 are
+    returned untouched, so functions can call this on normalized and raw DataFrames alike.
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+
+    date_format = _infer_date_format(series)
+    if date_format is None:
+        return pd.to_datetime(series, errors='coerce', dayfirst=True, format='mixed')
+    parsed = pd.to_datetime(series, format=date_format, errors='coerce')
+
+    # Values the inferred format did not fit are parsed on their own
+    missed = parsed.isna() & series.notna() & (series.astype(str).str.strip() != '')
+    if missed.any():
+        parsed[missed] = pd.to_datetime(series[missed], errors='coerce', dayfirst=True, format='mixed')
+    return parsed
+
+def normalize_date_columns(df, family):
+    """
+    Parse every date column of a report family's schema exactly once, replacing the strings with datetime64 columns.
+    """
+    schema = const.REPORT_SCHEMAS[family]
+    for column, dtype in schema.items():
+        if dtype == 'datetime' and column in df.columns:
+            df[column] = parse_dates(df[column])
+    return df
+
+def apply_report_schema(df, family):
+    """
+    Prune a DataFrame to the columns its report family uses and convert them to the schema dtypes.
+
+    Parameters:
+    - df (pd.DataFrame): The loaded export.
+    - family (str): 'project', 'contact' or 'document'.
+
+    Returns:
+    - pd.DataFrame: The pruned and typed DataFrame.
+    """
+    schema = const.REPORT_SCHEMAS[family]
+    df = df[[column for column in df.columns if column in schema]].copy()
+
+    for column, dtype in schema.items():
+        if dtype == 'category' and column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype('category')
+
+    if 'Priority' in df.columns:
+        df['Priority'] = order_priority(df['Priority'])
+
+    return normalize_date_columns(df, family)
+
+def read_typed_csv(csv_file, family):
+    """
+    Parse a CSV export reading only the columns of its report family, with the schema dtypes applied while parsing.
+    """
+    schema = const.REPORT_SCHEMAS[family]
+    dtypes = {column: dtype for column, dtype in schema.items() if dtype == 'category'}
+    df = pd.read_csv(csv_file, usecols=lambda column: column in schema, dtype=dtypes)
+
+    if 'Priority' in df.columns:
+        df['Priority'] = order_priority(df['Priority'])
+
+    return normalize_date_columns(df, family)
+
+def read_dataset(csv_file):
+    """
+    Parse a CSV export, using its snapshot instead when one is fresh.
+
+    Recognised exports (project, document and contact) are pruned to the columns the reports use and typed
+    with the schemas in constants.py; anything else is loaded as-is.
+    """
+    header = read_csv_header(csv_file)
+    family = detect_report_family(header)
+
+    columns = None
+    if family is not None:
+        columns = [column for column in header if column in const.REPORT_SCHEMAS[family]]
+
+    df = read_snapshot(csv_file, columns)
+    if df is None:
+        if family is None:
+            return create_blank_dataframe(csv_file)
+        return read_typed_csv(csv_file, family)
+
+    if family is None:
+        return df
+    return apply_report_schema(df, family)
+
+class ReportDataset:
+    """
+    A CSV export opened for a session (e.g. by the GUI).
+
+    Opening only reads the header to work out the report family. Single columns can then be read for
+    option lists without parsing the whole file, and the full DataFrame is parsed once, on first use,
+    and handed to the builders from then on.
+
+    Parameters:
+    - csv_file (str): Path to the CSV file.
+    """
+    def __init__(self, csv_file):
+        self.csv_file = csv_file
+        self.columns = read_csv_header(csv_file)
+        self.family = detect_report_family(self.columns)
+        self._frame = None
+
+    @property
+    def frame(self):
+        # Parsed (typed and pruned) on first use, then kept for the rest of the session
+        if self._frame is None:
+            self._frame = load_dataframe(self.csv_file)
+        return self._frame
+
+    def distinct_values(self, column):
+        """
+        Return the distinct non-empty values of a column, reading only that column if the file has not been parsed yet.
+        """
+        if self._frame is not None and column in self._frame.columns:
+            series = self._frame[column]
+        else:
+            series = pd.read_csv(self.csv_file, usecols=[column])[column]
+        return series.dropna().unique().tolist()
+
+def _dataset_cache_key(csv_file, teams):
+    # The file is identified by its path, modification time and size so an overwritten export is re-read
+    stat = os.stat(csv_file)
+    return (os.path.abspath(csv_file), stat.st_mtime_ns, stat.st_size, teams)
+
+def _dataset_cache_get(key, loader):
+    if key in _DATASET_CACHE:
+        _DATASET_CACHE.move_to_end(key)
+        return _DATASET_CACHE[key]
+
+    df = loader()
+    _DATASET_CACHE[key] = df
+
+    # Drop the least recently used datasets once the cache is full
+    while len(_DATASET_CACHE) > const.DATASET_CACHE_MAX_ENTRIES:
+        _DATASET_CACHE.popitem(last=False)
+
+    return df
+
+def load_dataframe(csv_file='./raw/DATA.csv'):
+    """
+    Load a CSV export through the shared dataset cache.
+
+    The file is only parsed the first time it is requested (or after it changes on disk),
+    every later call in the same process is served from memory.
+
+    Parameters:
+    - csv_file (str or pd.DataFrame): Path to the CSV file, or an already loaded DataFrame.
+
+    Returns:
+    - pd.DataFrame: A private copy of the parsed data that the caller is free to modify.
+    """
+    if isinstance(csv_file, pd.DataFrame):
+        return csv_file.copy()
+
+    key = _dataset_cache_key(csv_file, None)
+    df = _dataset_cache_get(key, lambda: read_dataset(csv_file))
+    return df.copy()
+
+def load_lead_team_dataframe(csv_file='./raw/DATA.csv', teams: Union[str, List[str]] = None):
+    """
+    Load a CSV export through the shared dataset cache and filter it with filter_by_lead_team.
+
+    Parameters:
+    - csv_file (str or pd.DataFrame): Path to the CSV file, or an already loaded DataFrame.
+    - teams (Union[str, List[str]], optional): Lead Team(s) to keep, see filter_by_lead_team.
+
+    Returns:
+    - pd.DataFrame: A private copy of the filtered data that the caller is free to modify.
+    """
+    if isinstance(csv_file, pd.DataFrame):
+        return filter_by_lead_team(csv_file, teams).copy()
+
+    teams_key = (teams,) if isinstance(teams, str) else tuple(teams) if teams is not None else ()
+    key = _dataset_cache_key(csv_file, teams_key)
+
+    def loader():
+        raw_key = _dataset_cache_key(csv_file, None)
+        df_first = _dataset_cache_get(raw_key, lambda: read_dataset(csv_file))
+        return filter_by_lead_team(df_first, teams)
+
+    df = _dataset_cache_get(key, loader)
+    return df.copy()
+
+def clear_dataset_cache(csv_file=None):
+    """
+    Invalidate the shared dataset cache.
+
+    Parameters:
+    - csv_file (str, optional): Only forget the datasets loaded from this file. Clears everything if omitted.
+    """
+    if csv_file is None:
+        _DATASET_CACHE.clear()
+        return
+
+    path = os.path.abspath(csv_file)
+    for key in [key for key in _DATASET_CACHE if key[0] == path]:
+        del _DATASET_CACHE[key]
+
 def filter_dataframe_by_team(dataframe, team_name):
-    filtered_df = dataframe[dataframe['Impacted Teams'].apply(lambda teams: team_name in teams)]
+    # Exact team name match, looked up in the frame's team index rather than scanning every row
+    positions = team_index(dataframe).get(team_name, [])
+    filtered_df = dataframe.iloc[positions]
     return filtered_df
 
+def contains_mask(series, substrings):
+    """
+    Boolean mask of the cells that contain any of the substrings, the vectorized form of
+    series.apply(lambda value: any(s in value for s in substrings)).
+
+    The substrings are tested once per distinct value (the categories of a categorical column,
+    otherwise the values found by pd.factorize) and the result is spread back to the rows through
+    the codes. Missing and non-text cells never match.
+
+    Parameters:
+    - series (pd.Series): The column to test.
+    - substrings (str or list): Substring or substrings to look for.
+
+    Returns:
+    - np.ndarray: True for the rows that contain at least one of the substrings.
+    """
+    if isinstance(substrings, str):
+        substrings = [substrings]
+    if len(substrings) == 0:
+        return np.zeros(len(series), dtype=bool)
+    pattern = re.compile('|'.join(re.escape(substring) for substring in substrings))
+
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes, values = series.cat.codes.to_numpy(), series.cat.categories
+    else:
+        codes, values = pd.factorize(series)
+
+    # One extra False at the end, so the -1 code of missing values looks up a non-match
+    matches = np.array([isinstance(value, str) and pattern.search(value) is not None for value in values] + [False])
+    return matches[codes]
+
 def filter_dataframe_by_status(dataframe, statuses):
-    if isinstance(statuses, str):
-        # If a single status is passed as a string, convert it to a list
-        statuses = [statuses]
-    
-    # Filter the dataframe for rows where the Status column contains any of the specified statuses
-    filtered_df = dataframe[dataframe['Status'].apply(lambda status: any(s in status for s in statuses))]
-    
+    # Rows where the Status column contains any of the specified statuses
+    filtered_df = dataframe[contains_mask(dataframe['Status'], statuses)]
     return filtered_df
 
 def filter_dataframe_by_release_group(dataframe, group):
-    filtered_df = dataframe[dataframe['Release Group'].apply(lambda groups: group in groups)]
+    filtered_df = dataframe[contains_mask(dataframe['Release Group'], group)]
     return filtered_df
 
 def filter_dataframe_by_staging(dataframe, staging):
-    filtered_df = dataframe[dataframe['Staging'].apply(lambda statuses: staging in statuses)]
+    filtered_df = dataframe[contains_mask(dataframe['Staging'], staging)]
     return filtered_df
 
 def filter_dataframe_by_contact_owner(dataframe, owner):
-    filtered_df = dataframe[dataframe['AssignedTo'].apply(lambda owners: owner in owners)]
+    filtered_df = dataframe[contains_mask(dataframe['AssignedTo'], owner)]
     return filtered_df
 
+def fillna_label(series, label):
+    """
+    Replace missing values with a label, adding the label as a category first when the column is categorical.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype) and label not in series.cat.categories:
+        series = series.cat.add_categories(label)
+    return series.fillna(label)
+
 def combine_dataframe(df1, df2):
     combined_df = pd.concat([df1, df2], ignore_index=True)
     return combined_df
 
-def impacted_teams_list(df):
-        # Define a function to handle NaN values and split strings
-    def process_teams(teams_str):
-        if isinstance(teams_str, str):
-            return [team.strip() for team in teams_str.strip('[]').replace('"', '').split(',')]
-        else:
-            return []
+def _split_teams(teams):
+    # '["Planning","Design"]' -> one row per team, indexed by the position of the row it came from
+    teams = teams.reset_index(drop=True)
+    teams = teams.str.strip('[]').str.replace('"', '', regex=False).str.split(',').explode().str.strip()
+    return teams[teams.notna() & (teams != '')]
 
-    # Apply the process_teams function to the Impacted Teams column
-    df['Impacted Teams'] = df['Impacted Teams'].apply(process_teams)
+def _column_buffers(df, columns):
+    # The arrays behind the indexed columns. Reassigning a column, or adding or dropping rows, gives it a new
+    # buffer, so comparing data pointers spots those edits without reading the values. The arrays are kept
+    # with the index so a freed buffer's address cannot be reused by a later column
+    arrays = [df[column].to_numpy() for column in columns]
+    return arrays, [(array.__array_interface__['data'][0], len(array)) for array in arrays]
 
-    # Create a set to store unique Impacted Teams
-    unique_teams = set()
+def _frame_index(df, name, columns, build):
+    # Build an index of row positions once per DataFrame and hand back the stored one on later calls.
+    # Checking the stored index is O(1): it is rebuilt if the columns it was built from have been replaced,
+    # edits to single cells go unnoticed until refresh_frame_indexes is called
+    key = (id(df), name)
+    arrays, stamp = _column_buffers(df, columns)
+    cached = _FRAME_INDEX_CACHE.get(key)
+    if cached is not None and cached[0]() is df and cached[1] == stamp:
+        return cached[3]
 
-    # Iterate through the rows and add Impacted Teams to the set
-    for teams_list in df['Impacted Teams']:
-        unique_teams.update(teams_list)
+    index = build()
 
-    # Convert the set back to a list if needed
-    unique_teams_list = list(unique_teams)
+    # Forget the index once the frame is garbage collected, so a new frame reusing its id is indexed afresh.
+    # Only this frame's entry is dropped, not one stored since for a new frame with the same id
+    def forget(ref):
+        if _FRAME_INDEX_CACHE.get(key, (None,))[0] is ref:
+            del _FRAME_INDEX_CACHE[key]
 
-    return (unique_teams_list)
+    _FRAME_INDEX_CACHE[key] = (weakref.ref(df, forget), stamp, arrays, index)
+    return index
 
-def convert_html_to_text_with_newlines(html_str):
+def refresh_frame_indexes(df):
     """
-    Convert a given HTML string to plain text while preserving newlines and fixing encoding issues.
-    This version also ensures that each sentence or paragraph is on a new line.
-    
+    Drop the stored team and staging indexes of a DataFrame, so they are built again on next use.
+
+    Call this after editing cells of the 'Impacted Teams' or 'Staging' columns in place (e.g. with df.loc),
+    replacing a whole column is picked up without it.
+
     Parameters:
-    - html_str (str): The HTML string to convert.
-    
+    - df (pd.DataFrame): The edited DataFrame.
+    """
+    for key in [key for key, cached in _FRAME_INDEX_CACHE.items() if key[0] == id(df) and cached[0]() is df]:
+        del _FRAME_INDEX_CACHE[key]
+
+def team_index(df, column='Impacted Teams'):
+    """
+    Map each team in a stringified list column to the row positions it appears in.
+
+    The column is parsed and exploded once per DataFrame, later calls for the same frame return the
+    stored index, so listing the teams and taking each team's rows are plain lookups. The index is
+    built again if the column has been replaced since, after editing single cells call refresh_frame_indexes.
+
+    Parameters:
+    - df (pd.DataFrame): The project or document DataFrame.
+    - column (str): The list column to index.
+
     Returns:
-    - str: A plain text representation of the HTML string with newlines preserved.
+    - dict: Team name -> numpy array of row positions, teams in alphabetical order.
     """
+    def build():
+        teams = _split_teams(df[column])
+        pairs = pd.DataFrame({'team': teams.to_numpy(), 'position': teams.index.to_numpy()}).drop_duplicates()
+        return {team: positions.to_numpy() for team, positions in pairs.groupby('team', sort=True)['position']}
 
-    if html_str is None or (isinstance(html_str, (float, int)) and np.isnan(html_str)) or (isinstance(html_str, str) and html_str.strip() == ""):
-        return ""
+    return _frame_index(df, column, [column], build)
 
-    # Use BeautifulSoup to parse the HTML    
-    soup = BeautifulSoup(html_str, 'html.parser')
-    
-    # Initialize an empty string to store the final text
+def staging_columns_index(df):
+    """
+    Split every impacted team's projects into the columns of the three column impact board in one pass.
+
+    Each column lists the rows whose Staging contains one of its stages in const.THREE_COL_STAGING,
+    stage by stage in the order given there, the same rows and order as filtering the team's projects
+    by each stage and concatenating the results.
+
+    Parameters:
+    - df (pd.DataFrame): The project DataFrame.
+
+    Returns:
+    - dict: Team name -> list with a numpy array of row positions for each board column.
+    """
+    def build():
+        teams = team_index(df)
+        empty = np.array([], dtype=np.intp)
+        if not teams:
+            return {}
+        team_codes = np.repeat(np.arange(len(teams)), [len(positions) for positions in teams.values()])
+        positions = np.concatenate(list(teams.values()))
+
+        # Every (team, row) pair is tested against each stage once, across all teams together
+        slots = [(column, stage) for column, stages in enumerate(const.THREE_COL_STAGING.values()) for stage in stages]
+        parts = []
+        for slot, (column, stage) in enumerate(slots):
+            hit = contains_mask(df['Staging'], stage)[positions]
+            parts.append(pd.DataFrame({'team': team_codes[hit], 'column': column, 'slot': slot, 'position': positions[hit]}))
+        board = pd.concat(parts, ignore_index=True).sort_values(['team', 'slot', 'position'], kind='stable')
+
+        grouped = {key: rows.to_numpy() for key, rows in board.groupby(['team', 'column'], sort=False)['position']}
+        return {
+            team: [grouped.get((code, column), empty) for column in range(len(const.THREE_COL_STAGING))]
+            for code, team in enumerate(teams)
+        }
+
+    return _frame_index(df, 'Staging columns', ['Impacted Teams', 'Staging'], build)
+
+def staging_columns_for_team(df, team_name):
+    """
+    The three column impact board DataFrames for one team, see staging_columns_index.
+    """
+    columns = staging_columns_index(df).get(team_name)
+    if columns is None:
+        return [df.iloc[[]] for _ in const.THREE_COL_STAGING]
+    return [df.iloc[positions] for positions in columns]
+
+def impacted_teams_list(df):
+    """
+    List the unique teams in the 'Impacted Teams' column, in alphabetical order. The DataFrame is not modified.
+    """
+    return list(team_index(df).keys())
+
+def _join_text_strings(strings):
     final_text = ""
-    
-    # Iterate over each element in the HTML
-    for elem in soup.stripped_strings:
-        # Add the text of the element to the final text
+    for elem in strings:
         final_text += elem
-        # Add a newline if the text ends with a period or is contained within a <p> tag
-        if elem.endswith('.') or (hasattr(elem, 'parent') and elem.parent.name == 'p'):
+        # Add a newline after each sentence
+        if elem.endswith('.'):
             final_text += "\n"
-    
+
     # Unescape HTML entities
     final_text = html.unescape(final_text)
-    
+
     # Remove any unwanted characters (e.g., â€‹ can appear due to encoding issues)
     final_text = final_text.replace("â€‹", "")
     final_text = final_text.replace("&%23160;", "")
@@ -102,6 +583,113 @@ def convert_html_to_text_with_newlines(html_str):
 
     return final_text.strip()  # Strip removes leading/trailing white spaces
 
+@lru_cache(maxsize=const.HTML_TEXT_CACHE_SIZE)
+def _html_to_text(html_str):
+    # Plain text has nothing to parse, it is a single string
+    if '<' not in html_str and '&' not in html_str:
+        return _join_text_strings([html_str.strip()])
+
+    # Text converted by an earlier run for the same output folder
+    store = cache.html_text_cache()
+    if store is not None:
+        text = store.get(html_str)
+        if text is not None:
+            return text
+
+    text = _parse_html_text(html_str)
+
+    if store is not None:
+        store.put(html_str, text)
+    return text
+
+def _parse_html_text(html_str):
+    # The parse itself, without any caching so it can run in a worker process
+    soup = BeautifulSoup(html_str, 'html.parser')
+    return _join_text_strings(soup.stripped_strings)
+
+def convert_html_to_text_with_newlines(html_str):
+    """
+    Convert a given HTML string to plain text while preserving newlines and fixing encoding issues.
+    This version also ensures that each sentence or paragraph is on a new line.
+
+    Results are memoised by content, so the same Release Text or Project Update is only parsed once per run,
+    and kept between runs in the cache opened by cache_utils.open_html_text_cache.
+    
+    Parameters:
+    - html_str (str): The HTML string to convert.
+    
+    Returns:
+    - str: A plain text representation of the HTML string with newlines preserved.
+    """
+
+    if html_str is None or (isinstance(html_str, (float, int)) and np.isnan(html_str)) or (isinstance(html_str, str) and html_str.strip() == ""):
+        return ""
+
+    return _html_to_text(str(html_str))
+
+def prerender_html_columns(df, columns=None, workers=None):
+    """
+    Convert the rich-text columns of a DataFrame to plain text up front, in parallel, so the slide code only reads the results.
+
+    Each distinct cell is converted once. Cells already in the memo or the on-disk cache are reused, the rest are
+    split into chunked batches over a ProcessPoolExecutor when there are enough of them to be worth the start-up cost.
+    The text lands in the columns named by const.PRERENDERED_TEXT_COLUMNS, empty cells become " ".
+
+    Parameters:
+    - df (pd.DataFrame): The DataFrame to convert.
+    - columns (list, optional): The HTML columns to convert. Defaults to those in const.PRERENDERED_TEXT_COLUMNS found in df.
+    - workers (int, optional): Worker processes. Defaults to the number of CPUs, 1 converts in this process.
+
+    Returns:
+    - pd.DataFrame: A copy of df with the converted text columns added.
+    """
+    df = df.copy()
+    if columns is None:
+        columns = [column for column in const.PRERENDERED_TEXT_COLUMNS if column in df.columns]
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    # Every distinct cell of every column, converted once
+    sources = pd.unique(pd.concat([df[column] for column in columns], ignore_index=True).dropna().astype(str)) if columns else []
+    converted = {}
+    misses = []
+    store = cache.html_text_cache()
+    for source in sources:
+        if source.strip() == "":
+            converted[source] = ""
+        elif '<' not in source and '&' not in source:
+            converted[source] = _html_to_text(source)
+        else:
+            text = store.get(source) if store is not None else None
+            if text is None:
+                misses.append(source)
+            else:
+                converted[source] = text
+
+    if workers > 1 and len(misses) >= const.PRERENDER_MIN_PARALLEL_CELLS:
+        chunksize = max(1, math.ceil(len(misses) / (workers * 4)))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            texts = list(executor.map(_parse_html_text, misses, chunksize=chunksize))
+    else:
+        texts = [_parse_html_text(source) for source in misses]
+
+    for source, text in zip(misses, texts):
+        converted[source] = text
+        if store is not None:
+            store.put(source, text)
+
+    for column in columns:
+        df[const.PRERENDERED_TEXT_COLUMNS.get(column, column + ' (Text)')] = df[column].map(
+            lambda value: " " if pd.isna(value) else converted[str(value)]
+        )
+    return df
+
+def _to_timestamp(value):
+    # Values from normalized date columns are already timestamps and are not parsed again
+    if isinstance(value, datetime):
+        return value
+    return pd.to_datetime(value, dayfirst=True)
+
 def calculate_total_age(creation_date_str, reference_date_str=None):
     """
     Calculate the total age in days from the creation date to the reference date.
@@ -114,20 +702,20 @@ def calculate_total_age(creation_date_str, reference_date_str=None):
     - int: Total age in days.
     """
     # Convert the creation date string to a datetime object
-    creation_date = pd.to_datetime(creation_date_str, dayfirst=True)
+    creation_date = _to_timestamp(creation_date_str)
     
     # If no reference date is provided, use the current date
     if reference_date_str is None:
         reference_date = datetime.now()
     else:
-        reference_date = pd.to_datetime(reference_date_str, dayfirst=True)
+        reference_date = _to_timestamp(reference_date_str)
     
     # Calculate the difference in days
     total_age_days = (reference_date - creation_date).days
 
     return total_age_days
 
-def calculate_business_days_age(creation_date_str, reference_date_str=None):
+def calculate_business_days_age(creation_date_str, reference_date_str=None, calendar=None):
     """
     Calculate the number of business days from the creation date to the reference date,
     accounting for tickets opened on weekends.
@@ -135,50 +723,50 @@ def calculate_business_days_age(creation_date_str, reference_date_str=None):
     Parameters:
     - creation_date_str: The creation date as a string (format: '%Y-%m-%d').
     - reference_date_str: The reference date as a string (format: '%Y-%m-%d'). Defaults to today.
+    - calendar (BusinessCalendar, optional): Working days, holidays and hours. Defaults to Monday to Friday, 09:00 to 17:00.
     
     Returns:
     - int: Number of business days.
     """
     # Convert the creation date string to a datetime object
-    creation_date = pd.to_datetime(creation_date_str, dayfirst=True)
+    creation_date = _to_timestamp(creation_date_str)
     
     # If no reference date is provided, use the current date
     if reference_date_str is None:
         reference_date = datetime.now()
     else:
-        reference_date = pd.to_datetime(reference_date_str, dayfirst=True)
+        reference_date = _to_timestamp(reference_date_str)
     
     # Check if either date is NaT (Not a Time)
     if pd.isna(creation_date) or pd.isna(reference_date):
         return np.nan
-    
-    # If the ticket was created on a weekend, adjust the creation date to the following Monday
-    if creation_date.weekday() >= 5:  # 5 is Saturday, 6 is Sunday
-        creation_date += timedelta(days=(7 - creation_date.weekday()))
-    
-    # Generate a range of all dates between creation_date and reference_date
-    all_days = pd.date_range(start=creation_date, end=reference_date, freq='B')  # 'B' stands for business days
 
-    # Calculate the number of business days
-    business_days = len(all_days)
-    
-    # Adjust for partial days if the ticket was opened or closed outside of business hours
-    if creation_date.time() > datetime.strptime("09:00:00", "%H:%M:%S").time():
-        business_days -= 1
-    if reference_date.time() < datetime.strptime("17:00:00", "%H:%M:%S").time():
-        business_days -= 1
-    
-    # Ensure the count doesn't go below zero
-    business_days = max(business_days, 0)
-    
-    return business_days
+    return int(cu.business_days_between([creation_date], [reference_date], calendar)[0])
 
-def calculate_and_group_ticket_ages(df):
+def business_days_column(creation_dates, reference_dates=None, calendar=None):
+    """
+    Calculate the business days age for a whole column of tickets at once.
+
+    Parameters:
+    - creation_dates (pd.Series): The creation dates.
+    - reference_dates (pd.Series): The reference dates, aligned with creation_dates. Defaults to today.
+    - calendar (BusinessCalendar, optional): Working days, holidays and hours. Defaults to Monday to Friday, 09:00 to 17:00.
+
+    Returns:
+    - pd.Series: Business days per ticket, integers unless some dates are missing (NaN).
+    """
+    creation_dates = parse_dates(creation_dates)
+    if reference_dates is not None:
+        reference_dates = parse_dates(reference_dates)
+    business_days = pd.Series(cu.business_days_between(creation_dates, reference_dates, calendar), index=creation_dates.index)
+    return business_days if business_days.isna().any() else business_days.astype(int)
+
+def calculate_and_group_ticket_ages(df, calendar=None):
     # Ensure we are working on a copy of the DataFrame
     df = df.copy()
 
     # Ensure the Age_BusinessDays column is calculated
-    df['Age_BusinessDays'] = df['OriginalCreationDate'].apply(lambda x: calculate_business_days_age(x))
+    df['Age_BusinessDays'] = business_days_column(df['OriginalCreationDate'], calendar=calendar)
 
     # Group by AssignedTo and calculate both the sum of Age_BusinessDays and the count of tickets
     grouped_df = df.groupby('AssignedTo').agg({
@@ -230,7 +818,7 @@ def filter_by_lead_team(df: pd.DataFrame, teams: Union[str, List[str]] = None) -
     
     return filtered_df
 
-def calculate_time_to_resolve(df):
+def calculate_time_to_resolve(df, calendar=None):
     """
     Calculate the time taken to resolve each ticket in business days and total days.
     Returns a dataframe with additional columns for these calculations.
@@ -238,8 +826,8 @@ def calculate_time_to_resolve(df):
     df = df.copy()
     
     # Ensure the columns are in datetime format
-    df['Resolved Time'] = pd.to_datetime(df['Completed Time'], errors='coerce', dayfirst=True)
-    df['Creation Time'] = pd.to_datetime(df['OriginalCreationDate'], errors='coerce', dayfirst=True)
+    df['Resolved Time'] = parse_dates(df['Completed Time'])
+    df['Creation Time'] = parse_dates(df['OriginalCreationDate'])
     
     # Drop rows with NaT in either 'Resolved Time' or 'Creation Time'
     df = df.dropna(subset=['Resolved Time', 'Creation Time'])
@@ -248,11 +836,11 @@ def calculate_time_to_resolve(df):
     df['TimeToResolve_Days'] = (df['Resolved Time'] - df['Creation Time']).dt.days
     
     # Calculate time to resolve in business days using a helper function
-    df['TimeToResolve_BusinessDays'] = df.apply(lambda row: calculate_business_days_age(row['OriginalCreationDate'], row['Completed Time']), axis=1)
+    df['TimeToResolve_BusinessDays'] = business_days_column(df['Creation Time'], df['Resolved Time'], calendar)
     
     return df
 
-def calculate_claim_time(df):
+def calculate_claim_time(df, calendar=None):
     """
     Calculate the time taken to claim each ticket in business days and total days.
     Returns a dataframe with additional columns for these calculations, including unclaimed tickets.
@@ -260,18 +848,14 @@ def calculate_claim_time(df):
     df = df.copy()
     
     # Ensure the columns are in datetime format
-    df['Claimed Date'] = pd.to_datetime(df['Claimed Date'], errors='coerce', dayfirst=True)
-    df['Creation Time'] = pd.to_datetime(df['OriginalCreationDate'], errors='coerce', dayfirst=True)
+    df['Claimed Date'] = parse_dates(df['Claimed Date'])
+    df['Creation Time'] = parse_dates(df['OriginalCreationDate'])
     
     # Keep rows where 'Creation Time' is valid, but allow NaT in 'Claimed Date'
     df = df.dropna(subset=['Creation Time'])
 
     # Calculate time to claim in business days, but only where 'Claimed Date' is not NaT
-    df['TimeToClaim_BusinessDays'] = df.apply(
-        lambda row: calculate_business_days_age(row['Creation Time'], row['Claimed Date']) 
-        if pd.notna(row['Claimed Date']) else None, 
-        axis=1
-    )
+    df['TimeToClaim_BusinessDays'] = business_days_column(df['Creation Time'], df['Claimed Date'], calendar)
     
     return df
 
@@ -315,12 +899,12 @@ def pre_filter_creation_time(df, start_date='2024-01-01', end_date='2024-12-31')
     end_date = pd.to_datetime(end_date)
 
     # Filter for rows where Status is 'Resolved' and within the date range
-    mask = pd.to_datetime(df['OriginalCreationDate'], errors='coerce', dayfirst=True).between(start_date, end_date)
+    mask = parse_dates(df['OriginalCreationDate']).between(start_date, end_date)
     df_filtered = df[mask].copy()
 
     return df_filtered
 
-def filter_and_aggregate_resolution_time(df, start_date='2024-01-01', end_date='2024-12-31', field='AssignedTo'):
+def filter_and_aggregate_resolution_time(df, start_date='2024-01-01', end_date='2024-12-31', field='AssignedTo', calendar=None):
     """
     Filters the DataFrame for resolved tickets within the specified date range and
     calculates the average resolution time by engineer.
@@ -328,7 +912,7 @@ def filter_and_aggregate_resolution_time(df, start_date='2024-01-01', end_date='
     Returns both the filtered DataFrame and the grouped DataFrame.
     """
     # Calculate the time to resolve for each ticket
-    df = calculate_time_to_resolve(df)
+    df = calculate_time_to_resolve(df, calendar)
 
     # Convert start_date and end_date to datetime
     start_date = pd.to_datetime(start_date)
@@ -336,7 +920,7 @@ def filter_and_aggregate_resolution_time(df, start_date='2024-01-01', end_date='
 
     # Filter for rows where Status is 'Resolved' and within the date range
     mask = (df['Status'] == 'Resolved') & \
-           (pd.to_datetime(df['Completed Time'], errors='coerce', dayfirst=True).between(start_date, end_date))
+           (df['Resolved Time'].between(start_date, end_date))
     df_filtered = df[mask].copy()
 
     # Group by engineer and calculate the average resolution time in business days
@@ -358,4 +942,224 @@ def filter_dataframe_by_names(df: pd.DataFrame, selected_names: list, field = 'C
     # Filter the DataFrame
     filtered_df = df[df[field].isin(selected_names)]
     
-    return filtered_df
\ No newline at end of file
+    return filtered_df
+def count_resolved_items_per_month(df, start_date='2024-01-01', end_date='2024-12-31'):
+    """
+    Count the resolved items per engineer per month for tickets created and completed within the date range.
+
+    Returns a DataFrame with the columns ['Closed by', 'YearMonth', 'ResolvedCount'].
+    """
+    time_filtered_df = pre_filter_creation_time(df, start_date, end_date)
+
+    # Filter for rows where Status is 'Resolved' and within the date range
+    resolved_df = time_filtered_df[(time_filtered_df['Status'] == 'Resolved') & 
+                     (parse_dates(time_filtered_df['Completed Time']).between(start_date, end_date))].copy()
+
+    # Ensure 'Completed Time' is treated as a datetime object
+    resolved_df['Completed Time'] = parse_dates(resolved_df['Completed Time'])
+
+    # Extract Year and Month from 'Completed Time'
+    resolved_df['YearMonth'] = resolved_df['Completed Time'].dt.to_period('M')
+
+    # Group by 'Closed by' and 'YearMonth' and count the number of resolved items
+    resolved_items_per_month = resolved_df.groupby(['Closed by', 'YearMonth']).size().reset_index(name='ResolvedCount')
+
+    return resolved_items_per_month
+
+def summarise_claim_times(df, start_date='2024-01-01', end_date='2024-12-31', calendar=None):
+    """
+    Summarise the claim times by engineer for tickets created within the date range, see analyze_claim_times.
+    """
+    time_filtered_df = pre_filter_creation_time(df, start_date, end_date)
+
+    # Calculate claim time and analyze the results
+    time_filtered_df = calculate_claim_time(time_filtered_df, calendar)
+    summary_df = analyze_claim_times(time_filtered_df)
+
+    return summary_df
+
+def summarise_closure_times(df_filtered):
+    """
+    Summarise the closure times by engineer from the resolved tickets returned by filter_and_aggregate_resolution_time.
+
+    Returns a DataFrame with the total tickets closed, the tickets closed within 4 weeks and the average close time.
+    """
+    closure_df = df_filtered.groupby('Closed by').agg(
+        total_tickets_closed=('Closed by', 'count'),
+        tickets_closed_less_4w=('TimeToResolve_BusinessDays', lambda x: sum(x < 20)),  # Assuming 4 weeks as 20 business days
+        average_close_time=('TimeToResolve_BusinessDays', 'mean')
+    ).reset_index()
+
+    # Adjust rounding to one decimal place without converting to integer
+    closure_df['average_close_time'] = closure_df['average_close_time'].fillna(0).round(1)
+
+    return closure_df
+
+def summarise_contact_log(df, selected_names=None, start_date='2024-01-01', end_date='2024-12-31', calendar=None):
+    """
+    Build every aggregate used by the Contact Log report from a loaded contact DataFrame.
+
+    Parameters:
+    - df (pd.DataFrame): The contact log.
+    - selected_names (list, optional): Only report on these engineers.
+    - start_date (str): Start of the reporting window.
+    - end_date (str): End of the reporting window.
+    - calendar (BusinessCalendar, optional): Working days, holidays and hours used for the claim and closure times.
+
+    Returns:
+    - dict: 'resolved_per_month', 'resolution_time', 'claim_summary' and 'closure_summary' DataFrames.
+    """
+    # If selected_names is provided, filter the DataFrame
+    if selected_names:
+        df_resolved = filter_dataframe_by_names(df, selected_names, 'Closed by')
+        df_assigned = filter_dataframe_by_names(df, selected_names, 'AssignedTo')
+    else:
+        df_resolved = df
+        df_assigned = df
+
+    df_filtered, df_grouped = filter_and_aggregate_resolution_time(df_resolved, start_date, end_date, field='Closed by', calendar=calendar)
+
+    return {
+        'resolved_per_month': count_resolved_items_per_month(df_resolved, start_date, end_date),
+        'resolution_time': df_grouped,
+        'claim_summary': summarise_claim_times(df_assigned, start_date, end_date, calendar),
+        'closure_summary': summarise_closure_times(df_filtered),
+    }
+
+def _fold(running, partial):
+    # Add a chunk's partial aggregates onto the running totals
+    if running is None:
+        return partial
+    return running.add(partial, fill_value=0)
+
+def aggregate_contact_log(csv_file, selected_names=None, start_date='2024-01-01', end_date='2024-12-31', chunksize=None, calendar=None):
+    """
+    Build the Contact Log report aggregates by streaming the CSV in fixed-size chunks.
+
+    Each chunk is cut down to the reporting window straight away and folded into running per-engineer
+    and per-month totals, so the full log never has to be held in memory. The result matches
+    summarise_contact_log for the same inputs.
+
+    Parameters:
+    - csv_file (str): Path to the contact CSV file.
+    - selected_names (list, optional): Only report on these engineers.
+    - start_date (str): Start of the reporting window.
+    - end_date (str): End of the reporting window.
+    - chunksize (int, optional): Rows per chunk. Defaults to const.CONTACT_CHUNK_SIZE.
+    - calendar (BusinessCalendar, optional): Working days, holidays and hours used for the claim and closure times.
+
+    Returns:
+    - dict: 'resolved_per_month', 'resolution_time', 'claim_summary' and 'closure_summary' DataFrames.
+    """
+    if chunksize is None:
+        chunksize = const.CONTACT_CHUNK_SIZE
+
+    window_start = pd.to_datetime(start_date)
+    window_end = pd.to_datetime(end_date)
+
+    schema = const.CONTACT_SCHEMA
+    reader = pd.read_csv(csv_file, usecols=lambda column: column in schema, chunksize=chunksize)
+
+    claims = None
+    closures = None
+    per_month = None
+
+    for chunk in reader:
+        # Dates are parsed once per chunk, the calculate_* helpers below reuse the typed columns
+        chunk = normalize_date_columns(chunk, 'contact')
+        creation = chunk['OriginalCreationDate']
+        completed = chunk['Completed Time']
+        created_in_window = creation.between(window_start, window_end)
+        completed_in_window = completed.between(window_start, window_end)
+
+        # Drop everything outside the reporting window before doing any per-ticket work
+        keep = created_in_window | completed_in_window
+        if not keep.any():
+            continue
+        chunk = chunk[keep]
+        creation = creation[keep]
+        completed = completed[keep]
+        created_in_window = created_in_window[keep]
+        completed_in_window = completed_in_window[keep]
+        resolved = (chunk['Status'] == 'Resolved') & completed_in_window
+
+        assigned = chunk
+        closed = chunk
+        if selected_names:
+            assigned = filter_dataframe_by_names(chunk, selected_names, 'AssignedTo')
+            closed = filter_dataframe_by_names(chunk, selected_names, 'Closed by')
+
+        # Claim times - tickets created in the window
+        claim_rows = assigned[created_in_window[assigned.index]]
+        if not claim_rows.empty:
+            claim_rows = calculate_claim_time(claim_rows, calendar)
+            claim_time = pd.to_numeric(claim_rows['TimeToClaim_BusinessDays'])
+            partial = pd.DataFrame({
+                'AssignedTo': claim_rows['AssignedTo'],
+                'total_tickets_assigned': 1,
+                'unclaimed_tickets': claim_rows['Claimed Date'].isna().astype(int),
+                'total_tickets': claim_time.notna().astype(int),
+                'exceed_two_days': (claim_time > 2).astype(int),
+                'claim_time_sum': claim_time.fillna(0),
+            }).groupby('AssignedTo').sum()
+            claims = _fold(claims, partial)
+
+        # Closure times - tickets resolved in the window
+        closure_rows = closed[resolved[closed.index] & creation[closed.index].notna()]
+        if not closure_rows.empty:
+            closure_rows = calculate_time_to_resolve(closure_rows, calendar)
+            resolve_time = closure_rows['TimeToResolve_BusinessDays']
+            partial = pd.DataFrame({
+                'Closed by': closure_rows['Closed by'],
+                'total_tickets_closed': 1,
+                'tickets_closed_less_4w': (resolve_time < 20).astype(int),
+                'resolve_time_sum': resolve_time,
+            }).groupby('Closed by').sum()
+            closures = _fold(closures, partial)
+
+        # Resolved items per month - tickets created and resolved in the window
+        month_rows = closed[(created_in_window & resolved)[closed.index]]
+        if not month_rows.empty:
+            partial = month_rows.groupby(['Closed by', completed[month_rows.index].dt.to_period('M').rename('YearMonth')]).size()
+            per_month = _fold(per_month, partial)
+
+    return {
+        'resolved_per_month': _finish_resolved_per_month(per_month),
+        'resolution_time': _finish_resolution_time(closures),
+        'claim_summary': _finish_claim_summary(claims),
+        'closure_summary': _finish_closure_summary(closures),
+    }
+
+def _finish_resolved_per_month(per_month):
+    if per_month is None:
+        return pd.DataFrame(columns=['Closed by', 'YearMonth', 'ResolvedCount'])
+    return per_month.astype(int).sort_index().reset_index(name='ResolvedCount')
+
+def _finish_resolution_time(closures):
+    if closures is None:
+        return pd.DataFrame(columns=['Closed by', 'TimeToResolve_BusinessDays'])
+    closures = closures.sort_index()
+    average = closures['resolve_time_sum'] / closures['total_tickets_closed']
+    return average.rename('TimeToResolve_BusinessDays').rename_axis('Closed by').reset_index()
+
+def _finish_claim_summary(claims):
+    columns = ['AssignedTo', 'avg_claim_time', 'exceed_two_days', 'total_tickets', 'total_tickets_assigned', 'unclaimed_tickets']
+    if claims is None:
+        return pd.DataFrame(columns=columns)
+
+    # Like analyze_claim_times, only engineers with at least one claimed ticket are reported
+    claims = claims[claims['total_tickets'] > 0].sort_index()
+    counts = claims[['exceed_two_days', 'total_tickets', 'total_tickets_assigned', 'unclaimed_tickets']].astype(int)
+    summary = counts.assign(avg_claim_time=claims['claim_time_sum'] / claims['total_tickets'])
+    return summary.rename_axis('AssignedTo').reset_index()[columns]
+
+def _finish_closure_summary(closures):
+    columns = ['Closed by', 'total_tickets_closed', 'tickets_closed_less_4w', 'average_close_time']
+    if closures is None:
+        return pd.DataFrame(columns=columns)
+
+    closures = closures.sort_index()
+    summary = closures[['total_tickets_closed', 'tickets_closed_less_4w']].astype(int)
+    average = closures['resolve_time_sum'] / closures['total_tickets_closed']
+    summary = summary.assign(average_close_time=average.fillna(0).round(1))
+    return summary.rename_axis('Closed by').reset_index()[columns]
@@ -1,6 +1,11 @@
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.ticker import MaxNLocator
+from io import BytesIO
+
+import utilities.constants as const
 
 def add_jitter(series, jitter_amount=0.1):
     """Add jitter to a Pandas series to avoid overlapping points in a scatter plot."""
@@ -47,93 +52,119 @@ def create_scatter_plot(df, priority_color_mapping, jitter_amount=0.1):
     # Display the plot
     plt.show()
 
-def create_age_bar_chart(df, output_path='age_bar_chart.png'):
+def save_figure(fig, output_path=None, dpi=None, image_format=None, **savefig_kwargs):
+    """
+    Render a figure to an image file, or to an in-memory buffer when no path is given.
+
+    Parameters:
+    - fig (Figure): The figure.
+    - output_path (str, optional): The image file to write.
+    - dpi (int, optional): Resolution of the image. Defaults to const.CHART_IMAGE_DPI.
+    - image_format (str, optional): e.g. 'png' or 'svg'. Defaults to the output_path extension, or const.CHART_IMAGE_FORMAT for buffers.
+
+    Returns:
+    - str or BytesIO: The output_path, or the buffer holding the image, ready to be read.
+    """
+    dpi = dpi or const.CHART_IMAGE_DPI
+    if output_path is None:
+        buffer = BytesIO()
+        fig.savefig(buffer, format=image_format or const.CHART_IMAGE_FORMAT, dpi=dpi, **savefig_kwargs)
+        buffer.seek(0)
+        return buffer
+    fig.savefig(output_path, format=image_format, dpi=dpi, **savefig_kwargs)
+    return output_path
+
+def create_age_bar_chart(df, output_path=None, dpi=None, image_format=None):
     # Create the horizontal bar chart
-    plt.figure(figsize=(10, 6))
-    bars = plt.barh(df['AssignedTo'], df['Age_BusinessDays'], color='skyblue')
-    plt.xlabel('Total Age in Business Days')
-    plt.ylabel('Assigned To')
-    plt.title('Total Age of Open Tickets by Assigned Person')
-    plt.gca().invert_yaxis()  # Invert the y-axis to have the longest bar on top
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    bars = ax.barh(df['AssignedTo'], df['Age_BusinessDays'], color='skyblue')
+    ax.set_xlabel('Total Age in Business Days')
+    ax.set_ylabel('Assigned To')
+    ax.set_title('Total Age of Open Tickets by Assigned Person')
+    ax.invert_yaxis()  # Invert the y-axis to have the longest bar on top
 
     # Add labels on each bar with the number of tickets
     for bar, count in zip(bars, df['TicketCount']):
         width = bar.get_width()
-        plt.text(width, bar.get_y() + bar.get_height()/2, f'{count} tickets', 
-                 va='center', ha='left', fontsize=10, color='black')
+        ax.text(width, bar.get_y() + bar.get_height()/2, f'{count} tickets', 
+                va='center', ha='left', fontsize=10, color='black')
 
-    # Save the chart as an image
-    plt.savefig(output_path, bbox_inches='tight')
-    plt.close()
+    # Render the chart as an image
+    return save_figure(fig, output_path, dpi, image_format, bbox_inches='tight')
 
-def plot_resolved_items_per_month(df, output_path='resolved_month_chart.png'):
+def plot_resolved_items_per_month(df, output_path=None, dpi=None, image_format=None):
     """
     Plots a stacked bar chart showing the number of resolved items per engineer per month.
     
     df: DataFrame with resolved items per month per engineer.
+    output_path: Path to save the generated chart image, the image is returned in a BytesIO buffer if None.
     """
     # Pivot the data to get engineers (Closed by) as columns and YearMonth as rows
     pivot_table = df.pivot(index='YearMonth', columns='Closed by', values='ResolvedCount').fillna(0)
 
     # Plot a stacked bar chart
-    pivot_table.plot(kind='bar', stacked=True, figsize=(10, 7), cmap='tab20')
+    fig = Figure(figsize=(10, 7))
+    ax = fig.subplots()
+    pivot_table.plot(kind='bar', stacked=True, cmap='tab20', ax=ax)
     
-    plt.title('Resolved Items Per Month (Closed by)')
-    plt.xlabel('Month')
-    plt.ylabel('Number of Resolved Items')
-    plt.legend(title='Closed By', bbox_to_anchor=(1.05, 1), loc='upper left')
-    plt.tight_layout()
-    plt.savefig(output_path, bbox_inches='tight')
-    plt.close()
-
-def plot_grouped_resolved_items_per_month(df, output_path='grouped_resolved_month_chart.png'):
+    ax.set_title('Resolved Items Per Month (Closed by)')
+    ax.set_xlabel('Month')
+    ax.set_ylabel('Number of Resolved Items')
+    ax.legend(title='Closed By', bbox_to_anchor=(1.05, 1), loc='upper left')
+    fig.tight_layout()
+    return save_figure(fig, output_path, dpi, image_format, bbox_inches='tight')
+
+def plot_grouped_resolved_items_per_month(df, output_path=None, dpi=None, image_format=None):
     """
     Plots a grouped bar chart showing the number of resolved items per engineer per month.
     
     df: DataFrame with resolved items per month per engineer.
-    output_path: Path to save the generated chart image.
+    output_path: Path to save the generated chart image, the image is returned in a BytesIO buffer if None.
     """
     # Pivot the data to get engineers (Closed by) as columns and YearMonth as rows
     pivot_table = df.pivot(index='YearMonth', columns='Closed by', values='ResolvedCount').fillna(0)
 
     # Plot a grouped bar chart
-    ax = pivot_table.plot(kind='bar', stacked=False, figsize=(10, 7), cmap='tab20')
-
-    plt.title('')
-    plt.xlabel('')
-    plt.ylabel('')
-    plt.legend(title='Closed By', bbox_to_anchor=(1.05, 1), loc='upper left')
-    plt.tight_layout()
-    plt.savefig(output_path, bbox_inches='tight')
-    plt.close()
-
-def plot_engineer_grouped_resolved_items(df, output_path='engineer_grouped_resolved_chart.png'):
+    fig = Figure(figsize=(10, 7))
+    ax = fig.subplots()
+    pivot_table.plot(kind='bar', stacked=False, cmap='tab20', ax=ax)
+
+    ax.set_title('')
+    ax.set_xlabel('')
+    ax.set_ylabel('')
+    ax.legend(title='Closed By', bbox_to_anchor=(1.05, 1), loc='upper left')
+    fig.tight_layout()
+    return save_figure(fig, output_path, dpi, image_format, bbox_inches='tight')
+
+def plot_engineer_grouped_resolved_items(df, output_path=None, dpi=None, image_format=None):
     """
     Plots a bar chart grouped by engineer, showing the number of resolved items per engineer per month.
     
     df: DataFrame with resolved items per month per engineer.
-    output_path: Path to save the generated chart image.
+    output_path: Path to save the generated chart image, the image is returned in a BytesIO buffer if None.
     """
     # Pivot the data so that engineers are the index, and each month is a separate column
     pivot_table = df.pivot(index='Closed by', columns='YearMonth', values='ResolvedCount').fillna(0)
 
     # Plot the grouped bar chart
-    ax = pivot_table.plot(kind='bar', stacked=False, figsize=(12, 8), cmap='tab20')
-
-    plt.title('')
-    plt.xlabel('')
-    plt.ylabel('Number of Tickets Closed')
-    plt.legend(title='Month', bbox_to_anchor=(1.05, 1), loc='upper left')
-    plt.tight_layout()
-    plt.savefig(output_path, bbox_inches='tight')
-    plt.close()
-
-def plot_resolution_time_by_engineer(df, output_path='resolution_time_chart.png'):
+    fig = Figure(figsize=(12, 8))
+    ax = fig.subplots()
+    pivot_table.plot(kind='bar', stacked=False, cmap='tab20', ax=ax)
+
+    ax.set_title('')
+    ax.set_xlabel('')
+    ax.set_ylabel('Number of Tickets Closed')
+    ax.legend(title='Month', bbox_to_anchor=(1.05, 1), loc='upper left')
+    fig.tight_layout()
+    return save_figure(fig, output_path, dpi, image_format, bbox_inches='tight')
+
+def plot_resolution_time_by_engineer(df, output_path=None, dpi=None, image_format=None):
     """
     Plots a bar chart showing the average resolution time by engineer.
     
     df: DataFrame with columns ['AssignedTo', 'TimeToResolve_BusinessDays'].
-    output_path: Path to save the generated chart image.
+    output_path: Path to save the generated chart image, the image is returned in a BytesIO buffer if None.
     """
     # Group by engineer and calculate the average resolution time
     grouped_df = df.groupby('Closed by')['TimeToResolve_BusinessDays'].mean().reset_index()
@@ -142,22 +173,22 @@ def plot_resolution_time_by_engineer(df, output_path='resolution_time_chart.png'
     grouped_df = grouped_df.sort_values(by='TimeToResolve_BusinessDays', ascending=False)
 
     # Plot the bar chart
-    plt.figure(figsize=(10, 6))
-    bars = plt.barh(grouped_df['Closed by'], grouped_df['TimeToResolve_BusinessDays'], color='skyblue')
-    plt.xlabel('Average Resolution Time in Business Days')
-    plt.ylabel('')
-    plt.title('')
-    plt.gca().invert_yaxis()  # Invert the y-axis to have the longest bar on top
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    bars = ax.barh(grouped_df['Closed by'], grouped_df['TimeToResolve_BusinessDays'], color='skyblue')
+    ax.set_xlabel('Average Resolution Time in Business Days')
+    ax.set_ylabel('')
+    ax.set_title('')
+    ax.invert_yaxis()  # Invert the y-axis to have the longest bar on top
     
     # Add labels on each bar
     for bar in bars:
         width = bar.get_width()
-        plt.text(width, bar.get_y() + bar.get_height()/2, f'{width:.1f} days', 
-                 va='center', ha='left', fontsize=10, color='black')
+        ax.text(width, bar.get_y() + bar.get_height()/2, f'{width:.1f} days', 
+                va='center', ha='left', fontsize=10, color='black')
     
-    # Save the chart as an image
-    plt.savefig(output_path, bbox_inches='tight')
-    plt.close()
+    # Render the chart as an image
+    return save_figure(fig, output_path, dpi, image_format, bbox_inches='tight')
 
 # Example usage of the refactored functions
 if __name__ == "__main__":
@@ -165,19 +196,20 @@ if __name__ == "__main__":
     project_df, priority_color_mapping = load_and_prepare_data(csv_file_path)
     create_scatter_plot(project_df, priority_color_mapping)
 
-def plot_claim_time_summary(df, output_path='claim_time_summary_chart.png'):
+def plot_claim_time_summary(df, output_path=None, dpi=None, image_format=None):
     """
     Plot the summary of claim times, showing average claim time and count of tickets exceeding 2 business days.
     
     df: Summary dataframe with average claim time, count exceeding 2 days, and total tickets.
-    output_path: Path to save the generated chart image.
+    output_path: Path to save the generated chart image, the image is returned in a BytesIO buffer if None.
     """
-    fig, ax1 = plt.subplots(figsize=(10, 6))
+    fig = Figure(figsize=(10, 6))
+    ax1 = fig.subplots()
 
     ax2 = ax1.twinx()
     
     width = 0.4
-    df.set_index('AssignedTo', inplace=True)
+    df = df.set_index('AssignedTo')
     
     df['avg_claim_time'].plot(kind='bar', color='blue', ax=ax1, width=width, position=1)
     df['exceed_two_days'].plot(kind='bar', color='red', ax=ax2, width=width, position=0)
@@ -188,7 +220,7 @@ def plot_claim_time_summary(df, output_path='claim_time_summary_chart.png'):
     # Set y-axis limits and enforce integer ticks on the right axis
     ax1.set_ylim(0, max(1, df['avg_claim_time'].max() * 1.2))
     ax2.set_ylim(0, max(1, df['exceed_two_days'].max() * 1.2))
-    ax2.yaxis.set_major_locator(plt.MaxNLocator(integer=True))
+    ax2.yaxis.set_major_locator(MaxNLocator(integer=True))
 
     ax1.set_xlabel('Engineer')
     ax1.set_title('Claim Time Summary by Engineer')
@@ -202,6 +234,5 @@ def plot_claim_time_summary(df, output_path='claim_time_summary_chart.png'):
         ax2.annotate(f'{p.get_height():.0f}', (p.get_x() + p.get_width() / 2., p.get_height()),
                      ha='center', va='center', xytext=(0, 10), textcoords='offset points')
 
-    plt.tight_layout()
-    plt.savefig(output_path)
-    plt.close()
+    fig.tight_layout()
+    return save_figure(fig, output_path, dpi, image_format)
@@ -2,13 +2,26 @@ from pptx import Presentation
 from pptx.util import Pt, Cm
 from pptx.enum.text import MSO_ANCHOR
 from pptx.enum.shapes import MSO_SHAPE
-import utilities.graph_utils as gu
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+import pptx.opc.serialized as pptx_serialized
+from pptx.oxml.ns import qn
+from pptx.oxml.shapes.autoshape import CT_Shape
+from pptx.shapes.autoshape import Shape
+from lxml.etree import SubElement
 from datetime import date, datetime
 import urllib.parse
 import pandas as pd
+import numpy as np
 import math
+import re
 import ast
+import copy
 import os
+import sys
+import threading
+import zipfile
+from io import BytesIO
+from concurrent.futures import Future
 from icecream import ic
 
 #import PresentationToolKit.utilities.constants as const 
@@ -16,19 +29,166 @@ from icecream import ic
 
 import utilities.constants as const 
 import utilities.data_utils as du
+import utilities.chart_utils as chu
+import utilities.cache_utils as cache
+
+# Styled button shapes built by _button_prototype, keyed by size, font size and colours
+_BUTTON_PROTOTYPES = {}
+
+# Control characters other than tab and line feed, which are not allowed in the XML of a text run
+_CONTROL_CHARACTERS = re.compile(r'[\x00-\x08\x0B-\x1F]')
+
+# Parsed templates, keyed by absolute path, with the (mtime, size) stamp they were read at
+_TEMPLATE_CACHE = {}
+
+def _graph_utils():
+    # graph_utils imports matplotlib, which is slow to load, so it is only imported once a chart is drawn with it.
+    # Reports without matplotlib charts, like the project and document release decks, never load it.
+    # The charts are only rendered to images, so the non-interactive backend is selected before pyplot is
+    # imported and no GUI toolkit is probed
+    if 'utilities.graph_utils' not in sys.modules:
+        import matplotlib
+        matplotlib.use('Agg')
+    import utilities.graph_utils as gu
+    return gu
+
+# graph_utils plot drawing the picture of each chart slide, when its backend is 'matplotlib'
+CHART_PLOTS = {
+    'resolved_items_per_month': 'plot_resolved_items_per_month',
+    'grouped_resolved_items_per_month': 'plot_grouped_resolved_items_per_month',
+    'engineer_grouped_resolved_items': 'plot_engineer_grouped_resolved_items',
+    'resolution_time': 'plot_resolution_time_by_engineer',
+}
+
+def draw_chart_image(plot_name, df):
+    """
+    Draw a graph_utils chart and return the image bytes. Module level, so it can be run in a worker process.
+    """
+    return getattr(_graph_utils(), plot_name)(df).getvalue()
+
+def chart_image_key(plot_name, df):
+    """
+    The chart image cache key of the picture plot_name draws from df: its data, plot and style.
+    Take it before the picture is drawn and use it for both cached_chart_image and cache_chart_image.
+    """
+    return cache.frame_key(df, plot_name, const.CHART_IMAGE_DPI, const.CHART_IMAGE_FORMAT, const.CHART_IMAGE_VERSION)
+
+def cached_chart_image(key):
+    """
+    The image bytes already drawn for a chart_image_key, or None.
+    """
+    return cache.chart_image_cache().get(key)
+
+def cache_chart_image(key, image):
+    """
+    Remember the image bytes drawn for a chart_image_key, see cached_chart_image.
+    """
+    cache.chart_image_cache().put(key, image)
+
+def render_chart_image(plot_name, df):
+    """
+    Draw a graph_utils chart into an in-memory image. Images already drawn from the same data, plot
+    and style are taken from the chart image cache, without loading matplotlib.
+
+    Parameters:
+    - plot_name (str): The graph_utils plot function, e.g. 'plot_resolved_items_per_month'.
+    - df (DataFrame): The aggregated data the plot function is given.
+
+    Returns:
+    - BytesIO: The image, ready to be inserted with insert_chart_into_slide.
+    """
+    key = chart_image_key(plot_name, df)
+    image = cached_chart_image(key)
+    if image is None:
+        image = draw_chart_image(plot_name, df)
+        cache_chart_image(key, image)
+    return BytesIO(image)
+
+def chart_image_specs(charts):
+    """
+    The pictures a deck's chart slides need, declared before the slides are built so they can be
+    drawn together, see builder.render_chart_images.
+
+    Parameters:
+    - charts (list): (chart, df, backend) of each chart slide, chart being a CHART_PLOTS key and backend
+                     None for the const.CHART_BACKENDS default.
+
+    Returns:
+    - dict: (plot_name, df) of the charts drawn with matplotlib, keyed by chart. Natively drawn charts are left out.
+    """
+    return {chart: (CHART_PLOTS[chart], df) for chart, df, backend in charts
+            if (backend or const.CHART_BACKENDS[chart]) != 'native'}
+
+def _load_template(template):
+    # Parse the template once per process, keyed by path and invalidated when the file changes
+    stat = os.stat(template)
+    key = os.path.abspath(template)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _TEMPLATE_CACHE.get(key)
+    if cached is None or cached[0] != stamp:
+        with open(template, 'rb') as file:
+            template_bytes = file.read()
+        cached = (stamp, Presentation(BytesIO(template_bytes)))
+        _TEMPLATE_CACHE[key] = cached
+    return cached[1]
 
 def create_blank_presentation(template='./templates/_template.pptx'):
-    prs = Presentation(template)
+    # Each deck is a deep copy of the parsed template, cheaper than unzipping and parsing the .pptx again
+    prs = copy.deepcopy(_load_template(template))
     return prs
 
-def save_exit(prs, report_type="PEA_Project_Report", modifier="", folder=""):
+class _ProfileZipModule:
+    # Stands in for the zipfile module inside python-pptx's package writer for one save, so the zip it
+    # writes is opened with the compression of a save profile. Everything else is the zipfile module
+    def __init__(self, profile):
+        self.profile = profile
+
+    def __getattr__(self, name):
+        return getattr(zipfile, name)
+
+    def ZipFile(self, file, mode='r', compression=zipfile.ZIP_STORED, allowZip64=True, compresslevel=None, **kwargs):
+        if mode == 'w':
+            compression, compresslevel = self.profile['compression'], self.profile['compresslevel']
+        return zipfile.ZipFile(file, mode, compression=compression, allowZip64=allowZip64, compresslevel=compresslevel, **kwargs)
+
+# python-pptx's writer (pptx.opc.serialized, 0.6.x) opens the zip through its module level zipfile import.
+# With another layout, decks are saved with its own compression whatever the profile
+_PROFILE_SAVES_SUPPORTED = getattr(pptx_serialized, 'zipfile', None) is zipfile
+_PROFILE_SAVE_LOCK = threading.Lock()
+
+def write_presentation(prs, file, save_profile=None):
+    """
+    Write a presentation to a path or an open binary file, compressed as set by a save profile.
+
+    The deck is written once by prs.save, straight into the file, with the zip compression of the
+    profile in place of python-pptx's usual one.
+
+    Parameters:
+    - prs (Presentation): The presentation.
+    - file (str or file): Where to write it.
+    - save_profile (str, optional): A key of const.SAVE_PROFILES. Defaults to const.DEFAULT_SAVE_PROFILE.
+    """
+    profile = const.SAVE_PROFILES[save_profile or const.DEFAULT_SAVE_PROFILE]
+    if profile is None or not _PROFILE_SAVES_SUPPORTED:
+        prs.save(file)
+        return
+    with _PROFILE_SAVE_LOCK:
+        pptx_serialized.zipfile = _ProfileZipModule(profile)
+        try:
+            prs.save(file)
+        finally:
+            pptx_serialized.zipfile = zipfile
+
+def save_exit(prs, report_type="PEA_Project_Report", modifier="", folder="", save_profile=None):
     # Save the PowerPoint presentation
     today = date.today()
     current_time = datetime.now().strftime("%H%M")  # Get current hour and minute
     output_pptx = f'{today.strftime("%y%m%d")}_{current_time}_{report_type}{modifier}.pptx'
 
     save_to_location = os.path.join(folder, output_pptx)  # Properly join the folder and filename
-    prs.save(save_to_location)
+    # The zip is streamed straight into the file, through a large buffer to keep writes to network shares few
+    with open(save_to_location, 'wb', buffering=const.SAVE_BUFFER_SIZE) as file:
+        write_presentation(prs, file, save_profile)
     return save_to_location  # Return the full path of the saved file
 
 def placeholder_identifier(slide):
@@ -58,31 +218,15 @@ def set_three_col_subtitle(slide):
 
 def set_document_release_subtitle(slide, heading='new', date='08/09/2023'):
     subtitle = const.DOC_BOARD_TITLES
+    # A list of headings is shown for slides with merged groups
+    if isinstance(heading, str):
+        heading = [heading]
     #hardcoded idx values that will be consistent for prs.slide_masters[1].slide_layouts[7] only
-    slide.placeholders[27].text = subtitle[heading]
+    slide.placeholders[27].text = " & ".join(subtitle[h] for h in heading)
     slide.placeholders[28].text = date
     return
 
-def create_project_button(slide, left, top, status="", contents_text="CONTENT", OVERRIDE="", hyperlink_string=None):
-    if OVERRIDE == "":
-        BUTTON_DEF = const.PROJECT_BUTTON_CONSTANTS
-    else:
-        BUTTON_DEF = OVERRIDE
-
-    # Add a rounded rectangle shape
-    rounded_rectangle = slide.shapes.add_shape(MSO_SHAPE.ROUNDED_RECTANGLE,
-                                            left, top, BUTTON_DEF['rectangle_width'], BUTTON_DEF['rectangle_height'])
-    if status == "":
-        FILL_COLOUR = BUTTON_DEF.get('fill', const.ThemeColors.PINK)
-        FONT_COLOUR = BUTTON_DEF.get('font_colour', const.ThemeColors.WHITE)
-        BORDER_COLOUR = BUTTON_DEF.get('border', const.ThemeColors.PINK)
-        FILL_BRIGHTNESS = BUTTON_DEF.get('fill_brightness', 0)
-    else:
-        FILL_COLOUR = BUTTON_DEF['status_colors'].get(status, const.ThemeColors.PINK)
-        BORDER_COLOUR = BUTTON_DEF.get('border', FILL_COLOUR)
-        FONT_COLOUR = BUTTON_DEF.get('font_colour', 0)
-        FILL_BRIGHTNESS = BUTTON_DEF.get('fill_brightness', 0)
-
+def _style_button(rounded_rectangle, FILL_COLOUR, FILL_BRIGHTNESS, BORDER_COLOUR):
     # Customize the rectangle Fill
     fill = rounded_rectangle.fill
     fill.solid()
@@ -102,92 +246,383 @@ def create_project_button(slide, left, top, status="", contents_text="CONTENT",
     shadow.angle = 0
     shadow.alpha = 0
 
-    text_box = rounded_rectangle.text_frame
-    text_box.text = contents_text
-    text_box.vertical_anchor = MSO_ANCHOR.TOP
+    rounded_rectangle.text_frame.vertical_anchor = MSO_ANCHOR.TOP
+
+def _button_prototype(BUTTON_DEF, FILL_COLOUR, FILL_BRIGHTNESS, BORDER_COLOUR, FONT_COLOUR):
+    """
+    The styled rounded rectangle XML for a button format and colour scheme, built once and reused for every card.
+
+    Returns:
+    - tuple: The <p:sp> element with an empty text body, and the <a:rPr> run properties for the first (bold) run and the other runs.
+    """
+    key = (BUTTON_DEF['rectangle_width'], BUTTON_DEF['rectangle_height'], BUTTON_DEF['font_size'],
+           FILL_COLOUR, FILL_BRIGHTNESS, BORDER_COLOUR, FONT_COLOUR)
+    prototype = _BUTTON_PROTOTYPES.get(key)
+    if prototype is None:
+        sp = CT_Shape.new_autoshape_sp(0, '', 'roundRect', 0, 0, BUTTON_DEF['rectangle_width'], BUTTON_DEF['rectangle_height'])
+        rounded_rectangle = Shape(sp, None)
+        _style_button(rounded_rectangle, FILL_COLOUR, FILL_BRIGHTNESS, BORDER_COLOUR)
+
+        # Style two sample runs the way every card's text is styled, then keep only their run properties
+        text_box = rounded_rectangle.text_frame
+        text_box.text = "first\nother"
+        first = 1
+        for paragraph in text_box.paragraphs:
+            for run in paragraph.runs:
+                if FONT_COLOUR != 0:
+                    run.font.color.theme_color = FONT_COLOUR
+                if first == 1:
+                    run.font.bold = True
+                    first = 0
+                run.font.size = BUTTON_DEF['font_size']
+        first_rPr, other_rPr = [r.rPr for r in sp.txBody.iter(qn('a:r'))]
+        sp.txBody.clear_content()
+
+        prototype = (sp, first_rPr, other_rPr)
+        _BUTTON_PROTOTYPES[key] = prototype
+    return prototype
+
+def _escape_control_characters(text):
+    # Written as plain text escapes, e.g. a BEL character as '_x0007_', the way python-pptx writes run text
+    return _CONTROL_CHARACTERS.sub(lambda match: '_x%04X_' % ord(match.group()), text)
+
+def _next_shape_id(spTree):
+    # One more than the highest shape id on the slide, as python-pptx numbers new shapes
+    return max((int(shape_id) for shape_id in spTree.xpath('//@id') if shape_id.isdigit()), default=0) + 1
+
+def _add_button_text(txBody, contents_text, first_rPr, other_rPr):
+    # Same paragraphs, runs and line breaks as setting text_frame.text, with the button run properties applied
+    first = True
+    for line in contents_text.split("\n"):
+        paragraph = SubElement(txBody, qn('a:p'))
+        for idx, run_text in enumerate(line.split("\v")):
+            if idx > 0:
+                SubElement(paragraph, qn('a:br'))
+            if run_text:
+                run = SubElement(paragraph, qn('a:r'))
+                run.append(copy.deepcopy(first_rPr if first else other_rPr))
+                first = False
+                SubElement(run, qn('a:t')).text = _escape_control_characters(run_text)
+
+def create_project_button(slide, left, top, status="", contents_text="CONTENT", OVERRIDE="", hyperlink_string=None):
+    if OVERRIDE == "":
+        BUTTON_DEF = const.PROJECT_BUTTON_CONSTANTS
+    else:
+        BUTTON_DEF = OVERRIDE
+
+    if status == "":
+        FILL_COLOUR = BUTTON_DEF.get('fill', const.ThemeColors.PINK)
+        FONT_COLOUR = BUTTON_DEF.get('font_colour', const.ThemeColors.WHITE)
+        BORDER_COLOUR = BUTTON_DEF.get('border', const.ThemeColors.PINK)
+        FILL_BRIGHTNESS = BUTTON_DEF.get('fill_brightness', 0)
+    else:
+        FILL_COLOUR = BUTTON_DEF['status_colors'].get(status, const.ThemeColors.PINK)
+        BORDER_COLOUR = BUTTON_DEF.get('border', FILL_COLOUR)
+        FONT_COLOUR = BUTTON_DEF.get('font_colour', 0)
+        FILL_BRIGHTNESS = BUTTON_DEF.get('fill_brightness', 0)
+
+    # Copy the pre-styled rounded rectangle and only fill in the id, position, text and hyperlink
+    prototype, first_rPr, other_rPr = _button_prototype(BUTTON_DEF, FILL_COLOUR, FILL_BRIGHTNESS, BORDER_COLOUR, FONT_COLOUR)
+    rounded_rectangle = copy.deepcopy(prototype)
+
+    spTree = slide.shapes.element
+    shape_id = _next_shape_id(spTree)
+    cNvPr = rounded_rectangle.nvSpPr.cNvPr
+    cNvPr.set('id', str(shape_id))
+    cNvPr.set('name', 'Rounded Rectangle %d' % (shape_id - 1))
+
+    offset = rounded_rectangle.spPr.xfrm.off
+    offset.set('x', '%d' % left)
+    offset.set('y', '%d' % top)
 
     if hyperlink_string:
         # Add the hyperlink to the shape
-        hyperlink = rounded_rectangle.click_action.hyperlink
-        hyperlink.address = hyperlink_string
-
-    first = 1
-    for paragraph in text_box.paragraphs:
-        for run in paragraph.runs:
-            if FONT_COLOUR != 0:
-                run.font.color.theme_color = FONT_COLOUR
-            if first == 1:
-                run.font.bold = True
-                first = 0
-            run.font.size = BUTTON_DEF['font_size']
-    first = 1
+        hyperlink = SubElement(cNvPr, qn('a:hlinkClick'))
+        hyperlink.set(qn('r:id'), slide.part.relate_to(hyperlink_string, RT.HYPERLINK, is_external=True))
+
+    _add_button_text(rounded_rectangle.txBody, contents_text, first_rPr, other_rPr)
+
+    spTree.insert_element_before(rounded_rectangle, 'p:extLst')
 
 def row_calculator(index, type=1):
     result = index / type
     row = math.floor(result)
     return row
 
-def populate_column(df, slide, BUTTON_FORMAT, SLIDE_FORMAT, COLUMN_FORMAT, type_flag='ProjectOwner', col=1):
-    for index, (_, project) in enumerate(df.iterrows()):
-        # Calculate current row and column
-        row = row_calculator(index, col)
-        
-        status = project['Status']
+def grid_rows_per_slide(prs, SLIDE_DEF, BUTTON_DEF):
+    """
+    Number of rows of buttons that fit on a slide, between SLIDE_DEF['start_top'] and SLIDE_DEF['bottom_margin'].
+    """
+    row_pitch = BUTTON_DEF['rectangle_height'] + SLIDE_DEF['vertical_spacing']
+    usable_height = prs.slide_height - SLIDE_DEF['bottom_margin'] - SLIDE_DEF['start_top'] + SLIDE_DEF['vertical_spacing']
+    return max(1, int(usable_height // row_pitch))
 
-        # Calculate position for the current rectangle
-        left = COLUMN_FORMAT['left']  
+def grid_slide_count(count, columns, rows_per_slide):
+    """
+    Number of slides needed for count buttons in a grid of the given columns, at least one.
+    """
+    rows = -(-count // columns)
+    return max(1, -(-rows // rows_per_slide))
+
+def grid_positions(count, column_lefts, start_top, row_pitch, rows_per_slide=None):
+    """
+    Lay out count buttons row by row across the given columns, all at once.
 
-        if 'right' in COLUMN_FORMAT:
-            right = COLUMN_FORMAT['right']
+    Parameters:
+    - count (int): The number of buttons.
+    - column_lefts (list): The left edge of each column, the grid has as many columns.
+    - start_top (int): The top of the first row.
+    - row_pitch (int): The button height plus the vertical spacing.
+    - rows_per_slide (int, optional): Rows that fit on a slide, the grid moves on to the next slide when full. Defaults to a single slide.
+
+    Returns:
+    - tuple: NumPy arrays of the slide number, left and top of each button.
+    """
+    index = np.arange(count)
+    column_lefts = np.asarray(column_lefts, dtype=np.int64)
+    rows = index // len(column_lefts)
+
+    if rows_per_slide is None:
+        slides = np.zeros(count, dtype=np.int64)
+    else:
+        slides, rows = np.divmod(rows, rows_per_slide)
+
+    return slides, column_lefts[index % len(column_lefts)], start_top + rows * row_pitch
+
+def paginate_groups(counts, columns, rows_per_slide, merge=False):
+    """
+    Split groups of buttons over slides. A group that does not fit on one slide is spread over as many as it needs,
+    and with merge, consecutive groups that fit together share a slide, each starting on a new row.
+
+    Parameters:
+    - counts (list): The number of buttons in each group.
+    - columns (int): The number of columns of the grid.
+    - rows_per_slide (int): Rows that fit on a slide.
+    - merge (bool): Put small groups on the same slide. Only the Document Release Board merges groups, as its
+                    subtitle can name several; project owner, objective and impacted team slides are titled with
+                    their one group, so each starts on its own slide.
+
+    Returns:
+    - list: One list per slide of (group, start, stop, first_row) tuples, the buttons start:stop of the group placed from first_row down.
+    """
+    per_slide = columns * rows_per_slide
+    slides = []
+    current = None
+    used_rows = 0
+    for group, count in enumerate(counts):
+        rows = -(-count // columns)
+        if merge and current is not None and used_rows + rows <= rows_per_slide:
+            current.append((group, 0, count, used_rows))
+            used_rows += rows
+        elif rows <= rows_per_slide:
+            current = [(group, 0, count, 0)]
+            slides.append(current)
+            used_rows = rows
         else:
-            right = left
-        
-        if not index % 2 == 0:
-            left = right
-
-        top = SLIDE_FORMAT['start_top'] + row * (BUTTON_FORMAT['rectangle_height'] + SLIDE_FORMAT['vertical_spacing'])
-
-        # Add project details to the rectangle (based on "type_flag" for specific contents)
-        if type_flag == 'ProjectOwner':
-            contents_text = f"{project['Title']}\n"
-            contents_text += f"Objective: {project['Objective']}\n"
-            contents_text += f"Staging: {const.get_staging_text(project['Staging'])}\n"
-            contents_text += f"Priority: {const.get_priority_text(project['Priority'])}"
-            if project['Status'] == 'Blocked':
-                contents_text += f"\nBlocked: {project['Closure Comments']}"
-
-        if type_flag == 'Objective':
-            contents_text = f"{project['Title']}\n"
-            contents_text += f"Owner: {project['Primary Owner']}\n"
-            contents_text += f"Staging: {const.get_staging_text(project['Staging'])}\n"
-            contents_text += f"{const.get_priority_text(project['Priority'])}"
-
-        if type_flag == 'Impact':
-            contents_text = f"{project['Title']}\n"
-            contents_text += f"Staging: {const.get_staging_text(project['Staging'])}"
-               
-        if type_flag == 'OnHold':
-            contents_text = f"{project['Title']}\n"
-            contents_text += f"Owner: {project['Primary Owner']}\n"
-            contents_text += f"Staging: {const.get_staging_text(project['Staging'])}\n"
-            contents_text += "Project Summary: "
-            if not pd.isna(project['Project Summary']):
-                contents_text += f"{project['Project Summary']}"
-
-        hyperlink = create_sharepoint_link(location="Project", title=project['Title'])
-
-        create_project_button(slide, left, top, status, contents_text, OVERRIDE=BUTTON_FORMAT, hyperlink_string=hyperlink)
+            # Groups spread over several slides are not merged with others
+            slides.extend([(group, start, min(start + per_slide, count), 0)] for start in range(0, count, per_slide))
+            current = None
+    return slides
+
+def continuation_title(title_text, slide_number, slide_count):
+    # Title of the slide_number'th (1-based) of slide_count slides showing one group
+    if slide_count == 1:
+        return title_text
+    return const.CONTINUATION_TITLE_FORMAT.format(title=title_text, slide=slide_number, slides=slide_count)
+
+def _card_field(df, column):
+    # The values of a column as f-string formatting would show them
+    return df[column].astype(object).map(str)
+
+def _staging_field(df):
+    return df['Staging'].astype(object).map(const.STAGING_TEXT_REPRESENTATION).fillna("-----")
+
+def _priority_field(df):
+    return df['Priority'].astype(object).map(const.PRIORITY_TEXT_REPRESENTATION).fillna("unknown")
+
+def _date_field(dates):
+    # Parsed dates shown as the export wrote them, missing ones as "nan" like the raw column did
+    return dates.dt.strftime(const.CARD_DATE_FORMAT).astype(object).fillna("nan")
+
+def _days_field(days):
+    return days.map(lambda value: "nan" if pd.isna(value) else str(int(value)))
+
+def _with_blocked_reason(df, text):
+    # Blocked projects show the closure comments as the reason
+    blocked = df['Status'] == 'Blocked'
+    return text.where(~blocked, text + "\nBlocked: " + _card_field(df, 'Closure Comments'))
+
+def _three_col_project_owner_text(df):
+    text = (_card_field(df, 'Title') + "\nObjective: " + _card_field(df, 'Objective')
+            + "\nStaging: " + _staging_field(df) + "\nPriority: " + _priority_field(df))
+    return _with_blocked_reason(df, text)
+
+def _three_col_impact_text(df):
+    return _card_field(df, 'Title') + "\nStaging: " + _staging_field(df)
+
+def _three_col_onhold_text(df):
+    summary = df['Project Summary'].astype(object)
+    summary = summary.where(summary.notna(), "").map(str)
+    return (_card_field(df, 'Title') + "\nOwner: " + _card_field(df, 'Primary Owner')
+            + "\nStaging: " + _staging_field(df) + "\nProject Summary: " + summary)
+
+def _objective_text(df):
+    return (_card_field(df, 'Title') + "\nOwner: " + _card_field(df, 'Primary Owner')
+            + "\nStaging: " + _staging_field(df) + "\n" + _priority_field(df))
+
+def _four_col_project_owner_text(df):
+    text = ("ID: " + _card_field(df, 'ID') + " - " + _card_field(df, 'Title') + "\nObjective: " + _card_field(df, 'Objective')
+            + "\nStaging: " + _staging_field(df) + "\nPriority: " + _priority_field(df))
+    return _with_blocked_reason(df, text)
+
+def _four_col_onhold_text(df):
+    return (_card_field(df, 'Title') + "\nOwner: " + _card_field(df, 'Primary Owner')
+            + "\nStaging: " + _staging_field(df) + "\nProject Summary: " + _card_field(df, 'Project Summary'))
+
+def _new_projects_text(df):
+    return ("ID: " + _card_field(df, 'ID') + " - " + _card_field(df, 'Title') + "\nOwner: " + _card_field(df, 'Primary Owner')
+            + "\nProject Summary: " + _card_field(df, 'Project Summary'))
+
+def _release_forecast_text(df):
+    return ("Document: " + _card_field(df, 'Doc Reference') + "\nTitle: " + _card_field(df, 'Title')
+            + "\nOwner: " + _card_field(df, 'Primary Owner'))
+
+def _contact_log_text(df):
+    creation_dates = du.parse_dates(df['OriginalCreationDate'])
+    business_days = du.business_days_column(creation_dates)
+    total_days = (pd.Timestamp(datetime.now()) - creation_dates).dt.days
+    return (_card_field(df, 'Title') + "\nRaised By: " + _card_field(df, 'RaisedBy')
+            + "\nCreated: " + _date_field(creation_dates)
+            + "\nAge: " + _days_field(business_days) + " || " + _days_field(total_days)
+            + "\nClaimed: " + _card_field(df, 'Claimed?'))
+
+def _title_text(df):
+    return _card_field(df, 'Title')
+
+def _document_heading(df, internal):
+    heading = "Document: " + _card_field(df, 'Doc Reference')
+    if internal:
+        heading = heading + "   ||   Status: " + _card_field(df, 'Status')
+    return heading
+
+def _document_owner(df, internal):
+    return "Owner: " + _card_field(df, 'Primary Owner') + "\n" if internal else ""
+
+def _document_new_text(df, detail, internal):
+    return (_document_heading(df, internal) + "\n" + _document_owner(df, internal)
+            + "Title: " + _card_field(df, 'Title') + "\nSummary: " + detail)
+
+def _document_update_text(df, detail, internal):
+    return (_document_heading(df, internal) + "\n" + _document_owner(df, internal)
+            + "Title: " + _card_field(df, 'Title') + "\nChanges: " + detail)
+
+def _document_release_impact_text(df, detail, internal):
+    return ("Document(s): " + _card_field(df, 'Doc Reference') + "\nChange Title: " + _card_field(df, 'Title')
+            + "\nSummary of Changes: " + detail)
+
+def _document_changes_text(df, detail, internal):
+    impact_tokens = df['Impact'].map(lambda impact: str(map_impact_to_symbols(impact)))
+    return ("Document: " + _card_field(df, 'Doc Reference') + "   ||   Impact: " + impact_tokens
+            + "\nTitle: " + _card_field(df, 'Title') + "\nDetail: " + detail)
+
+def _document_urgency_text(df, detail, internal):
+    return ("Document: " + _card_field(df, 'Doc Reference') + "\nTitle: " + _card_field(df, 'Title')
+            + "\nSummary: " + detail)
+
+# Card text formatters per slide layout and type_flag. Each formats a whole DataFrame at once,
+# the 'document' ones also take the cleaned release text and the internal flag
+CARD_TEXT_FORMATTERS = {
+    'three_cols': {
+        'ProjectOwner': _three_col_project_owner_text,
+        'Objective': _objective_text,
+        'Impact': _three_col_impact_text,
+        'OnHold': _three_col_onhold_text,
+    },
+    'four_cols': {
+        'ProjectOwner': _four_col_project_owner_text,
+        'Objective': _objective_text,
+        'Impact': _objective_text,
+        'OnHold': _four_col_onhold_text,
+        'NewProjects': _new_projects_text,
+        'Release Forecast': _release_forecast_text,
+        'ContactLog': _contact_log_text,
+    },
+    'all_projects': {
+        'ProjectOwner': _title_text,
+        'Objective': _title_text,
+        'Impact': _title_text,
+        'OnHold': _title_text,
+    },
+    'document': {
+        'new': _document_new_text,
+        'update': _document_update_text,
+        'release_impact': _document_release_impact_text,
+        'changes': _document_changes_text,
+        'urgency_monthly': _document_urgency_text,
+        'urgency_quarterly': _document_urgency_text,
+    },
+}
+
+# Where the cards link to, when not the layout's default
+CARD_LINK_LOCATIONS = {
+    ('four_cols', 'Release Forecast'): "Document",
+    ('four_cols', 'ContactLog'): None,
+}
+
+def compile_cards(df, layout='four_cols', type_flag='ProjectOwner', full_text=False, internal=False):
+    """
+    Build the text, status and hyperlink of every card for a slide, one column at a time.
 
-def create_body_slide_three_cols(df_1, df_2, df_3, prs, type_flag='ProjectOwner', title_text="", BUTTON_OVERRIDE=""):
-    # Function to take contents of df (dataframe) and output onto a 3 column grid using pre-sets from constants.py
-    # Set grid parameters
-    columns = 3  # Number of columns in the grid
+    Parameters:
+    - df (pd.DataFrame): The projects or documents, in card order.
+    - layout (str): The slide layout, a key of CARD_TEXT_FORMATTERS.
+    - type_flag (str): The card contents, a key of CARD_TEXT_FORMATTERS[layout].
+    - full_text (bool): For the 'document' layout, include the cleaned Release Text.
+    - internal (bool): For the 'document' layout, include the owner and status.
 
-    # Create a new slide
-    slide = prs.slides.add_slide(prs.slide_masters[1].slide_layouts[6])  # Blank slide layout
-    set_title(slide, title_text)
-    set_three_col_subtitle(slide)
+    Returns:
+    - tuple: Lists of contents text, status and hyperlink, one entry per row of df.
+    """
+    if df.empty:
+        return [], [], []
+
+    formatter = CARD_TEXT_FORMATTERS[layout][type_flag]
+    statuses = df['Status'].tolist()
+
+    if layout == 'document':
+        if full_text:
+            detail = df['Release Text'].map(du.convert_html_to_text_with_newlines)
+        else:
+            detail = ""
+        texts = formatter(df, detail, internal)
+        # Only the document changes cards are coloured by status outside of internal reports
+        if not internal and type_flag != 'changes':
+            statuses = [""] * len(df)
+        location = "Document"
+    else:
+        texts = formatter(df)
+        location = CARD_LINK_LOCATIONS.get((layout, type_flag), "Project")
 
+    if location is None:
+        hyperlinks = [None] * len(df)
+    else:
+        hyperlinks = create_sharepoint_links(df['Title'], location)
+
+    return texts.tolist(), statuses, hyperlinks
+
+def populate_column(df, slides, BUTTON_FORMAT, SLIDE_FORMAT, COLUMN_FORMAT, type_flag='ProjectOwner', col=1, rows_per_slide=None):
+    texts, statuses, hyperlinks = compile_cards(df, 'three_cols', type_flag)
+
+    # Column 1 alternates between its left and right positions
+    column_lefts = [COLUMN_FORMAT['left'], COLUMN_FORMAT.get('right', COLUMN_FORMAT['left'])][:col]
+    row_pitch = BUTTON_FORMAT['rectangle_height'] + SLIDE_FORMAT['vertical_spacing']
+    pages, lefts, tops = grid_positions(len(texts), column_lefts, SLIDE_FORMAT['start_top'], row_pitch, rows_per_slide)
+
+    for contents_text, status, hyperlink, page, left, top in zip(texts, statuses, hyperlinks, pages, lefts, tops):
+        create_project_button(slides[page], left, top, status, contents_text, OVERRIDE=BUTTON_FORMAT, hyperlink_string=hyperlink)
+
+def create_body_slide_three_cols(df_1, df_2, df_3, prs, type_flag='ProjectOwner', title_text="", BUTTON_OVERRIDE=""):
+    # Function to take contents of df (dataframe) and output onto a 3 column grid using pre-sets from constants.py
     # Set up Constants
     SLIDE_DEF = const.THREE_COL_SLIDE_CONSTANTS
 
@@ -209,99 +644,29 @@ def create_body_slide_three_cols(df_1, df_2, df_3, prs, type_flag='ProjectOwner'
     COLUMN_3 = {
         'left': SLIDE_DEF['start_left_col4']
     }
-        # Iterate through each project and add a rounded rectangle (COLUMN 1)
-    populate_column(df_1, slide, COL1_BUTTON_DEF, SLIDE_DEF, COLUMN_1, type_flag, col=2)
-    populate_column(df_2, slide, BUTTON_DEF, SLIDE_DEF, COLUMN_2, type_flag)
-    populate_column(df_3, slide, BUTTON_DEF, SLIDE_DEF, COLUMN_3, type_flag)
 
-def create_body_slide_four_cols(df, prs, type_flag='ProjectOwner', title_text="", BUTTON_OVERRIDE=""):
-    # Function to take contents of df (dataframe) and output onto a 4 column grid using pre-sets from constants.py
-    # Set grid parameters
-    columns = 4  # Number of columns in the grid
-
-    # Create a new slide
-    slide = prs.slides.add_slide(prs.slide_masters[1].slide_layouts[5])  # Blank slide layout
-    set_title(slide, title_text)
-
-    # Set up Constants
-    SLIDE_DEF = const.FOUR_COL_SLIDE_CONSTANTS
-
-    if BUTTON_OVERRIDE == "":
-        BUTTON_DEF = const.PROJECT_BUTTON_CONSTANTS
-    else:
-        BUTTON_DEF = BUTTON_OVERRIDE
-
-        # Iterate through each project and add a rounded rectangle
-    for index, (_, project) in enumerate(df.iterrows()):
-        # Calculate current row and column
-        row = index // columns
-        column = index % columns
-        status = project['Status']
+    # Create as many slides as the longest column needs
+    col1_rows = grid_rows_per_slide(prs, SLIDE_DEF, COL1_BUTTON_DEF)
+    rows = grid_rows_per_slide(prs, SLIDE_DEF, BUTTON_DEF)
+    slide_count = max(grid_slide_count(len(df_1), 2, col1_rows), grid_slide_count(len(df_2), 1, rows), grid_slide_count(len(df_3), 1, rows))
+    slides = []
+    for slide_number in range(1, slide_count + 1):
+        slide = prs.slides.add_slide(prs.slide_masters[1].slide_layouts[6])  # Blank slide layout
+        set_title(slide, continuation_title(title_text, slide_number, slide_count))
+        set_three_col_subtitle(slide)
+        slides.append(slide)
 
-        # Calculate position for the current rectangle
-        left = SLIDE_DEF['start_left'] + column * (BUTTON_DEF['rectangle_width'] + SLIDE_DEF['horizontal_spacing'])
-        top = SLIDE_DEF['start_top'] + row * (BUTTON_DEF['rectangle_height'] + SLIDE_DEF['vertical_spacing'])
-
-        hyperlink = create_sharepoint_link(location="Project", title=project['Title'])
-
-        # Add project details to the rectangle (based on "type_flag" for specific contents)
-        if type_flag == 'ProjectOwner':
-            contents_text = f"ID: {project['ID']} - {project['Title']}\n"
-            contents_text += f"Objective: {project['Objective']}\n"
-            contents_text += f"Staging: {const.get_staging_text(project['Staging'])}\n"
-            contents_text += f"Priority: {const.get_priority_text(project['Priority'])}"
-            if project['Status'] == 'Blocked':
-                contents_text += f"\nBlocked: {project['Closure Comments']}"
-
-        if type_flag == 'Objective':
-            contents_text = f"{project['Title']}\n"
-            contents_text += f"Owner: {project['Primary Owner']}\n"
-            contents_text += f"Staging: {const.get_staging_text(project['Staging'])}\n"
-            contents_text += f"{const.get_priority_text(project['Priority'])}"
-
-        if type_flag == 'Impact':
-            contents_text = f"{project['Title']}\n"
-            contents_text += f"Owner: {project['Primary Owner']}\n"
-            contents_text += f"Staging: {const.get_staging_text(project['Staging'])}\n"
-            contents_text += f"{const.get_priority_text(project['Priority'])}"
-
-        if type_flag == 'OnHold':
-            contents_text = f"{project['Title']}\n"
-            contents_text += f"Owner: {project['Primary Owner']}\n"
-            contents_text += f"Staging: {const.get_staging_text(project['Staging'])}\n"
-            contents_text += f"Project Summary: {project['Project Summary']}"
-
-        if type_flag == 'NewProjects':
-            contents_text = f"ID: {project['ID']} - {project['Title']}\n"
-            contents_text += f"Owner: {project['Primary Owner']}\n"
-            contents_text += f"Project Summary: {project['Project Summary']}"
-
-        if type_flag == 'Release Forecast':
-            contents_text = f"Document: {project['Doc Reference']}\n"
-            contents_text += f"Title: {project['Title']}\n"
-            contents_text += f"Owner: {project['Primary Owner']}"
-            hyperlink = create_sharepoint_link(location="Document", title=project['Title'])
-
-        if type_flag == 'ContactLog':
-            contents_text = f"{project['Title']}\n"
-            contents_text += f"Raised By: {project['RaisedBy']}\n"
-            contents_text += f"Created: {project['OriginalCreationDate']}\n"
-            contents_text += f"Age: {du.calculate_business_days_age(project['OriginalCreationDate'])} || {du.calculate_total_age(project['OriginalCreationDate'])}\n"
-            contents_text += f"Claimed: {project['Claimed?']}"
-            hyperlink = None
-            #TODO: write a ContactLog version of this: hyperlink = create_sharepoint_link(location="Document", title=project['Title'])
-
-        create_project_button(slide, left, top, status, contents_text, OVERRIDE=BUTTON_DEF, hyperlink_string=hyperlink)
+        # Iterate through each project and add a rounded rectangle (COLUMN 1)
+    populate_column(df_1, slides, COL1_BUTTON_DEF, SLIDE_DEF, COLUMN_1, type_flag, col=2, rows_per_slide=col1_rows)
+    populate_column(df_2, slides, BUTTON_DEF, SLIDE_DEF, COLUMN_2, type_flag, rows_per_slide=rows)
+    populate_column(df_3, slides, BUTTON_DEF, SLIDE_DEF, COLUMN_3, type_flag, rows_per_slide=rows)
 
-def create_body_slide_four_cols_all_projects(df, prs, type_flag='ProjectOwner', title_text="", BUTTON_OVERRIDE=""):
+def create_body_slide_four_cols(df, prs, type_flag='ProjectOwner', title_text="", BUTTON_OVERRIDE="", layout='four_cols'):
     # Function to take contents of df (dataframe) and output onto a 4 column grid using pre-sets from constants.py
+    # One group per call, titled title_text, so groups are never merged onto a slide (see paginate_groups)
     # Set grid parameters
     columns = 4  # Number of columns in the grid
 
-    # Create a new slide
-    slide = prs.slides.add_slide(prs.slide_masters[1].slide_layouts[5])  # Blank slide layout
-    set_title(slide, title_text)
-
     # Set up Constants
     SLIDE_DEF = const.FOUR_COL_SLIDE_CONSTANTS
 
@@ -310,33 +675,29 @@ def create_body_slide_four_cols_all_projects(df, prs, type_flag='ProjectOwner',
     else:
         BUTTON_DEF = BUTTON_OVERRIDE
 
-        # Iterate through each project and add a rounded rectangle
-    for index, (_, project) in enumerate(df.iterrows()):
-        # Calculate current row and column
-        row = index // columns
-        column = index % columns
-        status = project['Status']
+    texts, statuses, hyperlinks = compile_cards(df, layout, type_flag)
 
-        # Calculate position for the current rectangle
-        left = SLIDE_DEF['start_left'] + column * (BUTTON_DEF['rectangle_width'] + SLIDE_DEF['horizontal_spacing'])
-        top = SLIDE_DEF['start_top'] + row * (BUTTON_DEF['rectangle_height'] + SLIDE_DEF['vertical_spacing'])
+    # Calculate the slide and position of every rectangle, continuing on further slides when one is full
+    column_lefts = SLIDE_DEF['start_left'] + np.arange(columns) * (BUTTON_DEF['rectangle_width'] + SLIDE_DEF['horizontal_spacing'])
+    row_pitch = BUTTON_DEF['rectangle_height'] + SLIDE_DEF['vertical_spacing']
+    rows_per_slide = grid_rows_per_slide(prs, SLIDE_DEF, BUTTON_DEF)
+    pages, lefts, tops = grid_positions(len(texts), column_lefts, SLIDE_DEF['start_top'], row_pitch, rows_per_slide)
 
-        # Add project details to the rectangle (based on "type_flag" for specific contents)
-        if type_flag == 'ProjectOwner':
-            contents_text = f"{project['Title']}"
+    # Create the slides
+    slide_count = grid_slide_count(len(texts), columns, rows_per_slide)
+    slides = []
+    for slide_number in range(1, slide_count + 1):
+        slide = prs.slides.add_slide(prs.slide_masters[1].slide_layouts[5])  # Blank slide layout
+        set_title(slide, continuation_title(title_text, slide_number, slide_count))
+        slides.append(slide)
 
-        if type_flag == 'Objective':
-            contents_text = f"{project['Title']}"
-
-        if type_flag == 'Impact':
-            contents_text = f"{project['Title']}"
-
-        if type_flag == 'OnHold':
-            contents_text = f"{project['Title']}"
-
-        hyperlink = create_sharepoint_link(location="Project", title=project['Title'])
+        # Iterate through each project and add a rounded rectangle
+    for contents_text, status, hyperlink, page, left, top in zip(texts, statuses, hyperlinks, pages, lefts, tops):
+        create_project_button(slides[page], left, top, status, contents_text, OVERRIDE=BUTTON_DEF, hyperlink_string=hyperlink)
 
-        create_project_button(slide, left, top, status, contents_text, OVERRIDE=BUTTON_DEF, hyperlink_string=hyperlink)
+def create_body_slide_four_cols_all_projects(df, prs, type_flag='ProjectOwner', title_text="", BUTTON_OVERRIDE=""):
+    # Function to take contents of df (dataframe) and output onto a 4 column grid of titles only
+    create_body_slide_four_cols(df, prs, type_flag, title_text, BUTTON_OVERRIDE, layout='all_projects')
 
 def create_OnHold_slides(df, prs, no_section=False):
     if no_section == False:
@@ -356,38 +717,43 @@ def create_New_slides(df, prs, no_section=False):
     title_text = "New Projects - " + str(len(on_hold))
     create_body_slide_four_cols(sorted, prs, type_flag='NewProjects', title_text=title_text, BUTTON_OVERRIDE=const.NEW_PROJECT_BUTTON_CONSTANTS)
 
-def create_claim_time_summary_slide(df, prs, output_folder):
+def create_claim_time_summary_slide(df, prs, output_folder, calendar=None):
     """
     Create a slide that shows the average claim time, count of tickets exceeding 2 business days, and total tickets per engineer.
     """
     # Calculate claim time and analyze the results
-    df = du.calculate_claim_time(df)
+    df = du.calculate_claim_time(df, calendar)
     summary_df = du.analyze_claim_times(df)
 
-    # Plot the chart and save it as an image
-    chart_image_path = os.path.join(output_folder, 'claim_time_summary_chart.png')
-    gu.plot_claim_time_summary(summary_df, chart_image_path)
+    # Plot the chart into an in-memory image, or reuse the one cached for the same data
+    chart_image = render_chart_image('plot_claim_time_summary', summary_df)
     
     # Add a new slide for the chart
     slide = prs.slides.add_slide(prs.slide_masters[1].slide_layouts[5])  # Choose an appropriate layout
     set_title(slide, 'Claim Time Summary by Engineer (Graph)')
-    insert_chart_into_slide(prs, slide, chart_image_path)
+    insert_chart_into_slide(prs, slide, chart_image)
 
     return prs
 
-def create_claim_time_summary_table_slide(df, prs, output_folder, start_date='2024-01-01', end_date='2024-12-31'):
+def create_claim_time_summary_table_slide(df, prs, output_folder, start_date='2024-01-01', end_date='2024-12-31', calendar=None):
     """
     Create a slide with a table showing the summary of claim times by engineer.
     
     df: The dataframe containing the contact data.
     prs: The PowerPoint presentation object.
+    calendar: The calendar_utils.BusinessCalendar claim times are counted in, defaults to Monday to Friday, 09:00 to 17:00.
     """
-    time_filtered_df = du.pre_filter_creation_time(df, start_date, end_date)
-
     # Calculate claim time and analyze the results
-    time_filtered_df = du.calculate_claim_time(time_filtered_df)
-    summary_df = du.analyze_claim_times(time_filtered_df)
+    summary_df = du.summarise_claim_times(df, start_date, end_date, calendar)
+    return create_claim_time_table_slide(summary_df, prs)
+
+def create_claim_time_table_slide(summary_df, prs):
+    """
+    Create a slide with a table showing the summary of claim times by engineer.
     
+    summary_df: The claim time summary from du.summarise_claim_times or du.aggregate_contact_log.
+    prs: The PowerPoint presentation object.
+    """
     # Reset index to ensure engineer names are accessible
     summary_df = summary_df.reset_index()
     
@@ -428,21 +794,22 @@ def create_claim_time_summary_table_slide(df, prs, output_folder, start_date='20
 
     return prs
 
-def create_closure_time_summary_table_slide(df, prs, output_folder, start_date='2024-01-01', end_date='2024-12-31'):
+def create_closure_time_summary_table_slide(df, prs, output_folder, start_date='2024-01-01', end_date='2024-12-31', calendar=None):
           
-    # Get both filtered and aggregated data
-    df_filtered, df_grouped = du.filter_and_aggregate_resolution_time(df, start_date, end_date, field='Closed by')
+    # Get both filtered and aggregated data, the business days counted in calendar
+    df_filtered, df_grouped = du.filter_and_aggregate_resolution_time(df, start_date, end_date, field='Closed by', calendar=calendar)
 
     # Now we need to aggregate further to get the closure summary, but use the individual counts and times
-    closure_df = df_filtered.groupby('Closed by').agg(
-        total_tickets_closed=('Closed by', 'count'),
-        tickets_closed_less_4w=('TimeToResolve_BusinessDays', lambda x: sum(x < 20)),  # Assuming 4 weeks as 20 business days
-        average_close_time=('TimeToResolve_BusinessDays', 'mean')
-    ).reset_index()
-
-    # Adjust rounding to one decimal place without converting to integer
-    closure_df['average_close_time'] = closure_df['average_close_time'].fillna(0).round(1)
+    closure_df = du.summarise_closure_times(df_filtered)
+    return create_closure_time_table_slide(closure_df, prs)
 
+def create_closure_time_table_slide(closure_df, prs):
+    """
+    Create a slide with a table showing the summary of closure times by engineer.
+    
+    closure_df: The closure time summary from du.summarise_closure_times or du.aggregate_contact_log.
+    prs: The PowerPoint presentation object.
+    """
     # Create the slide and add the table
     slide = prs.slides.add_slide(prs.slide_masters[1].slide_layouts[5])
     set_title(slide, 'Closure Time Summary by Engineer')
@@ -473,28 +840,42 @@ def create_closure_time_summary_table_slide(df, prs, output_folder, start_date='
 
     return prs
 
-def create_resolution_time_by_engineer_slide(df, prs, output_folder, start_date='2024-01-01', end_date='2024-12-31'):
+def create_resolution_time_by_engineer_slide(df, prs, output_folder, start_date='2024-01-01', end_date='2024-12-31', calendar=None):
     """
     Create a slide with a bar chart showing the average resolution time by engineer.
     
     df: The dataframe containing the contact data.
     prs: The PowerPoint presentation object.
+    calendar: The calendar_utils.BusinessCalendar resolution times are counted in, defaults to Monday to Friday, 09:00 to 17:00.
     """
     # Process the DataFrame to filter and aggregate resolution times by engineer
-    df_filtered, df_grouped = du.filter_and_aggregate_resolution_time(df, start_date, end_date, field='Closed by')
-
-    # Plot the chart and save it as an image
-    chart_image_path = os.path.join(output_folder, 'resolution_time_chart.png')
-    gu.plot_resolution_time_by_engineer(df_grouped, chart_image_path)
+    df_filtered, df_grouped = du.filter_and_aggregate_resolution_time(df, start_date, end_date, field='Closed by', calendar=calendar)
+    return create_resolution_time_chart_slide(df_grouped, prs, output_folder)
 
+def create_resolution_time_chart_slide(df_grouped, prs, output_folder, backend=None, chart_image=None):
+    """
+    Create a slide with a bar chart showing the average resolution time by engineer.
+    
+    df_grouped: The average resolution time per engineer ['Closed by', 'TimeToResolve_BusinessDays'].
+    prs: The PowerPoint presentation object.
+    backend: 'native' or 'matplotlib', defaults to const.CHART_BACKENDS['resolution_time'].
+    chart_image: The picture, when drawn beforehand by builder.render_chart_images (bytes or a Future of them).
+    """
     # Add a new slide for the chart
     slide = prs.slides.add_slide(prs.slide_masters[1].slide_layouts[5])  # Choose an appropriate layout
     set_title(slide, 'Average Resolution Time')
-    insert_chart_into_slide(prs, slide, chart_image_path)
+
+    if (backend or const.CHART_BACKENDS['resolution_time']) == 'native':
+        chu.add_resolution_time_chart(slide, df_grouped)
+    else:
+        if chart_image is None:
+            # Plot the chart into an in-memory image, or reuse the one cached for the same data
+            chart_image = render_chart_image('plot_resolution_time_by_engineer', df_grouped)
+        insert_chart_into_slide(prs, slide, chart_image)
 
     return prs
 
-def create_open_and_onhold_contact_chart(df, prs, output_folder, no_section=False):
+def create_open_and_onhold_contact_chart(df, prs, output_folder, no_section=False, calendar=None, backend=None):
     if no_section == False:
         create_title_slide(prs, f'Open and On-Hold Tickets Report')
 
@@ -502,74 +883,90 @@ def create_open_and_onhold_contact_chart(df, prs, output_folder, no_section=Fals
     df_combined_tickets = du.filter_dataframe_by_status(df, ['Pending', 'On Hold'])
 
     # Calculate and group the ages by AssignedTo
-    grouped_df = du.calculate_and_group_ticket_ages(df_combined_tickets)
-
-    # Create the bar chart and save it as an image
-    chart_path = os.path.join(output_folder, 'age_bar_chart.png')
-    
-    gu.create_age_bar_chart(grouped_df, chart_path)
+    grouped_df = du.calculate_and_group_ticket_ages(df_combined_tickets, calendar)
 
     # Create a new slide for the chart
     chart_slide = prs.slides.add_slide(prs.slide_masters[1].slide_layouts[5])  # Use an appropriate slide layout
     set_title(chart_slide, 'Age of Open Tickets')
 
-    # Insert the chart into the new slide
-    insert_chart_into_slide(prs, chart_slide, chart_path)
+    if (backend or const.CHART_BACKENDS['open_ticket_age']) == 'native':
+        chu.add_age_bar_chart(chart_slide, grouped_df)
+    else:
+        # Create the bar chart as an in-memory image, or reuse the one cached for the same data
+        chart_image = render_chart_image('create_age_bar_chart', grouped_df)
+
+        # Insert the chart into the new slide
+        insert_chart_into_slide(prs, chart_slide, chart_image)
 
     return
 
-def create_resolved_items_per_month_chart_slide(df, prs, output_folder):
+def create_resolved_items_per_month_chart_slide(df, prs, output_folder, backend=None, chart_image=None):
     """
     Create a slide with a stacked bar chart showing the number of resolved items per engineer per month.
     
     df: The dataframe containing the contact data
     prs: The PowerPoint presentation object
     output_folder: Pathstring to output_folder
+    backend: 'native' or 'matplotlib', defaults to const.CHART_BACKENDS['resolved_items_per_month']
+    chart_image: The picture, when drawn beforehand by builder.render_chart_images (bytes or a Future of them)
     """
-    # Plot the chart and save it as an image
-    chart_image_path = os.path.join(output_folder, 'resolved_items_chart.png')
-    gu.plot_resolved_items_per_month(df, chart_image_path)
-
     # Add a new slide for the chart
     slide = prs.slides.add_slide(prs.slide_masters[1].slide_layouts[5])  # Choose an appropriate layout
     set_title(slide, 'Resolved Items Per Month')
-    insert_chart_into_slide(prs, slide, chart_image_path)
+
+    if (backend or const.CHART_BACKENDS['resolved_items_per_month']) == 'native':
+        chu.add_resolved_items_per_month_chart(slide, df)
+    else:
+        if chart_image is None:
+            # Plot the chart into an in-memory image, or reuse the one cached for the same data
+            chart_image = render_chart_image('plot_resolved_items_per_month', df)
+        insert_chart_into_slide(prs, slide, chart_image)
 
     return prs
 
-def create_grouped_resolved_items_per_month_chart_slide(df, prs, output_folder):
+def create_grouped_resolved_items_per_month_chart_slide(df, prs, output_folder, backend=None, chart_image=None):
     """
     Create a slide with a grouped bar chart showing the number of resolved items per engineer per month.
     
     df: The dataframe containing the contact data
     prs: The PowerPoint presentation object
+    backend: 'native' or 'matplotlib', defaults to const.CHART_BACKENDS['grouped_resolved_items_per_month']
+    chart_image: The picture, when drawn beforehand by builder.render_chart_images (bytes or a Future of them)
     """
-    # Plot the chart and save it as an image
-    chart_image_path = os.path.join(output_folder, 'grouped_resolved_items_chart.png')
-    gu.plot_grouped_resolved_items_per_month(df, chart_image_path)
-
     # Add a new slide for the chart
     slide = prs.slides.add_slide(prs.slide_masters[1].slide_layouts[5])  # Choose an appropriate layout
     set_title(slide, 'Resolved Items Per Month (Grouped)')
-    insert_chart_into_slide(prs, slide, chart_image_path)
+
+    if (backend or const.CHART_BACKENDS['grouped_resolved_items_per_month']) == 'native':
+        chu.add_grouped_resolved_items_per_month_chart(slide, df)
+    else:
+        if chart_image is None:
+            # Plot the chart into an in-memory image, or reuse the one cached for the same data
+            chart_image = render_chart_image('plot_grouped_resolved_items_per_month', df)
+        insert_chart_into_slide(prs, slide, chart_image)
    
     return prs
 
-def create_engineer_grouped_resolved_items_chart_slide(df, prs, output_folder):
+def create_engineer_grouped_resolved_items_chart_slide(df, prs, output_folder, backend=None, chart_image=None):
     """
     Create a slide with a bar chart grouped by engineer, showing the number of resolved items per engineer per month.
     
     df: The dataframe containing the contact data
     prs: The PowerPoint presentation object
+    backend: 'native' or 'matplotlib', defaults to const.CHART_BACKENDS['engineer_grouped_resolved_items']
+    chart_image: The picture, when drawn beforehand by builder.render_chart_images (bytes or a Future of them)
     """
-    # Plot the chart and save it as an image
-    chart_image_path = os.path.join(output_folder, 'engineer_grouped_resolved_chart.png')
-    gu.plot_engineer_grouped_resolved_items(df, chart_image_path)
-
     # Add a new slide for the chart
     slide = prs.slides.add_slide(prs.slide_masters[1].slide_layouts[5])  # Choose an appropriate layout
     set_title(slide, 'Resolved Items per Month (Grouped)')
-    insert_chart_into_slide(prs, slide, chart_image_path)
+
+    if (backend or const.CHART_BACKENDS['engineer_grouped_resolved_items']) == 'native':
+        chu.add_engineer_grouped_resolved_items_chart(slide, df)
+    else:
+        if chart_image is None:
+            # Plot the chart into an in-memory image, or reuse the one cached for the same data
+            chart_image = render_chart_image('plot_engineer_grouped_resolved_items', df)
+        insert_chart_into_slide(prs, slide, chart_image)
    
     return prs
 
@@ -611,24 +1008,8 @@ def create_resolved_items_per_month_slides(df, prs, output_folder, start_date='2
     start_date: The start of the date range to filter the data (default is '2024-01-01')
     end_date: The end of the date range to filter the data (default is '2024-12-31')
     """
-    # Convert start_date and end_date to datetime
-   
-    time_filtered_df = du.pre_filter_creation_time(df, start_date, end_date)
-
-    # Filter for rows where Status is 'Resolved' and within the date range
-    resolved_df = time_filtered_df[(time_filtered_df['Status'] == 'Resolved') & 
-                     (pd.to_datetime(time_filtered_df['Completed Time'], errors='coerce', dayfirst=True).between(start_date, end_date))].copy()
-
-    # Ensure 'Completed Time' is treated as a datetime object
-    resolved_df['Completed Time'] = pd.to_datetime(resolved_df['Completed Time'], errors='coerce', dayfirst=True)
+    resolved_items_per_month = du.count_resolved_items_per_month(df, start_date, end_date)
 
-    # Extract Year and Month from 'Completed Time'
-    resolved_df['YearMonth'] = resolved_df['Completed Time'].dt.to_period('M')
-
-    # Group by 'Closed by' and 'YearMonth' and count the number of resolved items
-    resolved_items_per_month = resolved_df.groupby(['Closed by', 'YearMonth']).size().reset_index(name='ResolvedCount')
-
-    #TODO: consider moving these slide creators back to builder.py and moving this logic into data_utils to create a cleaner flow
     #Create the Table Page
     #create_resolved_items_per_month_table_slide(resolved_items_per_month, prs)
 
@@ -683,20 +1064,12 @@ def create_Impacted_section(df, prs, no_section=False, impacted_team='Training')
 
     # Filter projects by Impacted Team
     projects = du.filter_dataframe_by_team(df, impacted_team)
-    sorted_projects = projects.sort_values(by=['Priority'])
 
     title_text = impacted_team  + " - " + str(len(projects))
-#    create_body_slide_four_cols(sorted_projects, prs, 'Impact', title_text)
-
-    df_triage = du.filter_dataframe_by_staging(projects, 'Triage')
-    df_analysis = du.filter_dataframe_by_staging(projects, 'Analysis')
-    df_alpha = du.filter_dataframe_by_staging(projects, 'Alpha Test')
-    df_beta = du.filter_dataframe_by_staging(projects, 'Beta Test')
-    df_rollout = du.filter_dataframe_by_staging(projects, 'Roll-out')
+#    create_body_slide_four_cols(projects.sort_values(by=['Priority']), prs, 'Impact', title_text)
 
-    col1 = du.combine_dataframe(df_triage, df_analysis)
-    col2 = du.combine_dataframe(df_alpha, df_beta)
-    col3 = df_rollout
+    # Assessing / Testing / Preparing Release columns, split for every team at once on the first call
+    col1, col2, col3 = du.staging_columns_for_team(df, impacted_team)
 
     create_body_slide_three_cols(col1, col2, col3, prs, 'Impact', title_text)
 
@@ -791,23 +1164,28 @@ def create_project_section(df, prs, no_section=False):
     
     #DF Filtering Logic goes here
 
+    # Convert all the Project Updates / Actions HTML in one parallel pass before building the slides
+    df = du.prerender_html_columns(df)
+
     for index, (_, project) in enumerate(df.iterrows()):
         create_single_project_slide(project, prs)
     return
 
-def create_single_project_slide(project, prs, title_text=""):
+def get_project_text(project, column):
+    # Use the text converted by du.prerender_html_columns when it is there
+    text_column = const.PRERENDERED_TEXT_COLUMNS[column]
+    if text_column in project.index:
+        return project[text_column]
 
-    update = project['Project Updates']
-    if pd.isna(update):
-       update = " " 
-    else:
-        update = du.convert_html_to_text_with_newlines(update)
+    text = project[column]
+    if pd.isna(text):
+        return " "
+    return du.convert_html_to_text_with_newlines(text)
 
-    action = project['Project Actions']
-    if pd.isna(action):
-       action = " " 
-    else:
-        action = du.convert_html_to_text_with_newlines(action)
+def create_single_project_slide(project, prs, title_text=""):
+
+    update = get_project_text(project, 'Project Updates')
+    action = get_project_text(project, 'Project Actions')
 
     summary = project['Project Summary']
     if pd.isna(summary):
@@ -835,7 +1213,7 @@ def create_document_release_section(df, prs, filter='', internal=False):
     if filter:
         df = df.loc[df['Release Group'] == filter]
 
-    grouped = df.groupby(df['Release Group'].fillna('None'))
+    grouped = df.groupby(du.fillna_label(df['Release Group'], 'None'), observed=True)
 
     for date, documents in grouped:
         title_text = 'Technical Releases'
@@ -850,8 +1228,7 @@ def create_document_release_section(df, prs, filter='', internal=False):
         sorted_new_docs = new_docs.sort_values(by=['Doc Reference'])
         sorted_update_docs = update_docs.sort_values(by=['Doc Reference'])
 
-        create_document_release_slide(sorted_new_docs, prs, date, title_text, const.DOCUMENT_BUTTON_CONSTANTS, type_flag='new', full_text=True, internal=internal)
-        create_document_release_slide(sorted_update_docs, prs, date, title_text, const.DOCUMENT_BUTTON_CONSTANTS, type_flag='update', full_text=True,internal=internal)
+        create_document_release_slides([('new', sorted_new_docs), ('update', sorted_update_docs)], prs, date, title_text, const.DOCUMENT_BUTTON_CONSTANTS, full_text=True, internal=internal)
     return
 
 def create_document_release_section_commercial_impacts(df, prs, filter='', internal=False):
@@ -859,7 +1236,7 @@ def create_document_release_section_commercial_impacts(df, prs, filter='', inter
     if filter:
         df = df.loc[df['Release Group'] == filter]
 
-    grouped = df.groupby(df['Release Group'].fillna('None'))
+    grouped = df.groupby(du.fillna_label(df['Release Group'], 'None'), observed=True)
 
     for date, documents in grouped:
         title_text = 'Release Urgency'
@@ -874,8 +1251,7 @@ def create_document_release_section_commercial_impacts(df, prs, filter='', inter
         sorted_Others = urgency_Others.sort_values(by=['Doc Reference'])
         sorted_Housekeeping = urgency_Housekeeping.sort_values(by=['Doc Reference'])
 
-        create_document_release_slide(sorted_Others, prs, date, title_text, const.DOCUMENT_BUTTON_CONSTANTS, type_flag='urgency_monthly', full_text=True, internal=internal)
-        create_document_release_slide(sorted_Housekeeping, prs, date, title_text, const.DOCUMENT_BUTTON_CONSTANTS, type_flag='urgency_quarterly', full_text=True, internal=internal)
+        create_document_release_slides([('urgency_monthly', sorted_Others), ('urgency_quarterly', sorted_Housekeeping)], prs, date, title_text, const.DOCUMENT_BUTTON_CONSTANTS, full_text=True, internal=internal)
     return
 
 def create_document_release_section_multi_filter(df, prs, filter=[], internal=False):
@@ -883,7 +1259,7 @@ def create_document_release_section_multi_filter(df, prs, filter=[], internal=Fa
     if filter:
         df = df[df['Release Group'].isin(filter)]   
 
-    grouped = df.groupby(df['Release Group'].fillna('None'))
+    grouped = df.groupby(du.fillna_label(df['Release Group'], 'None'), observed=True)
 
     for date, documents in grouped:
         title_text = 'Technical Releases'
@@ -898,8 +1274,7 @@ def create_document_release_section_multi_filter(df, prs, filter=[], internal=Fa
         sorted_new_docs = new_docs.sort_values(by=['Doc Reference'])
         sorted_update_docs = update_docs.sort_values(by=['Doc Reference'])
 
-        create_document_release_slide(sorted_new_docs, prs, date, title_text, const.DOCUMENT_BUTTON_CONSTANTS, type_flag='new', full_text=True, internal=internal)
-        create_document_release_slide(sorted_update_docs, prs, date, title_text, const.DOCUMENT_BUTTON_CONSTANTS, type_flag='update', full_text=True,internal=internal)
+        create_document_release_slides([('new', sorted_new_docs), ('update', sorted_update_docs)], prs, date, title_text, const.DOCUMENT_BUTTON_CONSTANTS, full_text=True, internal=internal)
     return
 
 
@@ -954,13 +1329,21 @@ def create_document_Impacted_section_multi_filter(df, prs, no_section=False, imp
 
 def create_document_release_slide(df, prs, date='08/09/2023', title_text=" ", BUTTON_OVERRIDE="", type_flag='new', full_text=False, internal=False):
     # Function to take contents of df (dataframe) and output onto a 2 column grid using pre-sets from constants.py for the Document Release Board
-    columns = 2
-    status_text = ""
+    create_document_release_slides([(type_flag, df)], prs, date, title_text, BUTTON_OVERRIDE, full_text, internal)
 
-    # Create a new slide
-    slide = prs.slides.add_slide(prs.slide_masters[1].slide_layouts[7])  # Blank slide layout
-    set_title(slide, title_text)
-    set_document_release_subtitle(slide, type_flag, date)
+def create_document_release_slides(groups, prs, date='08/09/2023', title_text=" ", BUTTON_OVERRIDE="", full_text=False, internal=False):
+    """
+    Output groups of documents onto the 2 column grid of the Document Release Board. Groups that do not fit on
+    one slide continue on further slides, and consecutive groups that fit together are merged onto one slide.
+
+    Parameters:
+    - groups (list): (type_flag, df) pairs, e.g. the new and the updated documents of a release.
+    - date (str): The subtitle date.
+    - title_text (str): The slide title.
+    - full_text (bool): Include the cleaned Release Text.
+    - internal (bool): Include the owner and status.
+    """
+    columns = 2
 
     # Set up Constants
     SLIDE_DEF = const.DOC_RELEASE_SLIDE_CONSTANTS
@@ -970,68 +1353,39 @@ def create_document_release_slide(df, prs, date='08/09/2023', title_text=" ", BU
     else:
         BUTTON_DEF = BUTTON_OVERRIDE
 
-        # Iterate through each project and add a rounded rectangle
-    for index, (_, project) in enumerate(df.iterrows()):
-        # Calculate current row and column
-        row = index // columns
-        column = index % columns
-        status = project['Status']
-
-        # Calculate position for the current rectangle
-        left = SLIDE_DEF['start_left'] + column * (BUTTON_DEF['rectangle_width'] + SLIDE_DEF['horizontal_spacing'])
-        top = SLIDE_DEF['start_top'] + row * (BUTTON_DEF['rectangle_height'] + SLIDE_DEF['vertical_spacing'])
-
-        if full_text:
-            clean_detail = du.convert_html_to_text_with_newlines(project['Release Text'])
-        else:
-            clean_detail = ""
-
-        if internal:
-            status_text = f"   ||   Status: {status}"
-
-        # Add project details to the rectangle (based on "type_flag" for specific contents)
-        if type_flag == 'new':
-            contents_text = f"Document: {project['Doc Reference']}{status_text}\n"
-            if internal:
-                contents_text += f"Owner: {project['Primary Owner']}\n"
-            contents_text += f"Title: {project['Title']}\n"
-            contents_text += f"Summary: {clean_detail}"
-            if not internal:
-                status = ""
-
-        if type_flag == 'update':
-            contents_text = f"Document: {project['Doc Reference']}{status_text}\n"
-            if internal:            
-                contents_text += f"Owner: {project['Primary Owner']}\n"
-            contents_text += f"Title: {project['Title']}\n"
-            contents_text += f"Changes: {clean_detail}"
-            if not internal:
-                status = ""
-
-        if type_flag == 'release_impact':
-            contents_text = f"Document(s): {project['Doc Reference']}\n"
-            contents_text += f"Change Title: {project['Title']}\n"
-            contents_text += f"Summary of Changes: {clean_detail}"
-            if not internal:
-                status = ""
-
-        if type_flag == 'changes':
-            impact_token = map_impact_to_symbols(project['Impact'])
-
-            contents_text = f"Document: {project['Doc Reference']}   ||   Impact: {impact_token}\n"
-            contents_text += f"Title: {project['Title']}\n"
-            contents_text += f"Detail: {clean_detail}"
-
-        if type_flag in ['urgency_monthly', 'urgency_quarterly']:
-            contents_text = f"Document: {project['Doc Reference']}\n"
-            contents_text += f"Title: {project['Title']}\n"
-            contents_text += f"Summary: {clean_detail}"
-            if not internal:
-                status = ""
-
-        hyperlink = create_sharepoint_link(location="Document", title=project['Title'])
-
-        create_project_button(slide, left, top, status, contents_text, OVERRIDE=BUTTON_DEF, hyperlink_string=hyperlink)
+    cards = [compile_cards(df, 'document', type_flag, full_text=full_text, internal=internal) for type_flag, df in groups]
+
+    column_lefts = SLIDE_DEF['start_left'] + np.arange(columns) * (BUTTON_DEF['rectangle_width'] + SLIDE_DEF['horizontal_spacing'])
+    row_pitch = BUTTON_DEF['rectangle_height'] + SLIDE_DEF['vertical_spacing']
+    rows_per_slide = grid_rows_per_slide(prs, SLIDE_DEF, BUTTON_DEF)
+    pages = paginate_groups([len(texts) for texts, _, _ in cards], columns, rows_per_slide, merge=True)
+
+    group_slide_count = {}
+    for page in pages:
+        for group, _, _, _ in page:
+            group_slide_count[group] = group_slide_count.get(group, 0) + 1
+
+    group_slide_number = {}
+    for page in pages:
+        # Empty groups merged with others are not named in the subtitle
+        shown = [group for group, start, stop, _ in page if stop > start] or [page[0][0]]
+        slide_title = title_text
+        if len(page) == 1:
+            group = page[0][0]
+            group_slide_number[group] = group_slide_number.get(group, 0) + 1
+            slide_title = continuation_title(title_text, group_slide_number[group], group_slide_count[group])
+
+        # Create a new slide
+        slide = prs.slides.add_slide(prs.slide_masters[1].slide_layouts[7])  # Blank slide layout
+        set_title(slide, slide_title)
+        set_document_release_subtitle(slide, [groups[group][0] for group in shown], date)
+
+        # Iterate through each document and add a rounded rectangle
+        for group, start, stop, first_row in page:
+            texts, statuses, hyperlinks = cards[group]
+            _, lefts, tops = grid_positions(stop - start, column_lefts, SLIDE_DEF['start_top'] + first_row * row_pitch, row_pitch)
+            for contents_text, status, hyperlink, left, top in zip(texts[start:stop], statuses[start:stop], hyperlinks[start:stop], lefts, tops):
+                create_project_button(slide, left, top, status, contents_text, OVERRIDE=BUTTON_DEF, hyperlink_string=hyperlink)
     return
 
 def map_impact_to_symbols(impact_str: str):
@@ -1053,21 +1407,28 @@ def url_encode_string(input_string):
 
 def create_sharepoint_link(location = "Project", title="Test"):
     encoded_title = url_encode_string(title)
-    if location == "Project":
-        link = f"https://cityfibreholdings.sharepoint.com/sites/PassiveEngineeringandArchitecture/Lists/Engineering%20Change%20Board/My%20Tickets.aspx?viewid=528f2921%2Db441%2D4617%2D9a90%2D28d029afdd79&FilterField1=LinkTitle&FilterValue1={encoded_title}&FilterType1=Computed"
-    if location == "Document":
-        link = f"https://cityfibreholdings.sharepoint.com/sites/PassiveEngineeringArchitecture/Lists/Document%20Change%20Log/9%20Report%20Output.aspx?FilterField1=LinkTitle&FilterValue1={encoded_title}&FilterType1=Computed"
-    return link
+    return const.SHAREPOINT_LINK_FORMATS[location].format(encoded_title)
+
+def create_sharepoint_links(titles, location="Project"):
+    # SharePoint links for a column of titles, each distinct title is only encoded once
+    link_format = const.SHAREPOINT_LINK_FORMATS[location]
+    links = {title: link_format.format(url_encode_string(title)) for title in pd.unique(titles)}
+    return [links[title] for title in titles]
 
 def insert_chart_into_slide(prs, slide, chart_path):
-    # Add the image to the slide
-    left = Cm(1.43)
-    top = Cm(2.2)
-    height = Cm(15.43)  # Set the height and let width auto-adjust
+    # Add the image to the slide, chart_path being an image file or an in-memory buffer from graph_utils,
+    # or the image bytes, possibly still being drawn by a builder.render_chart_images worker
+    if isinstance(chart_path, Future):
+        chart_path = chart_path.result()
+    if isinstance(chart_path, bytes):
+        chart_path = BytesIO(chart_path)
+    left = const.CHART_AREA['left']
+    top = const.CHART_AREA['top']
+    height = const.CHART_AREA['height']  # Set the height and let width auto-adjust
     slide.shapes.add_picture(chart_path, left, top, height=height)
     
     # Clean up the image file
-    if os.path.exists(chart_path):
+    if isinstance(chart_path, (str, os.PathLike)) and os.path.exists(chart_path):
         os.remove(chart_path)
 
     return prs
\ No newline at end of file